@@ -64,12 +64,8 @@ def upgrade() -> None:
     )
     op.create_index(op.f('ix_rag_chunks_document_id'), 'rag_chunks', ['document_id'], unique=False)
 
-    # Create HNSW index for fast vector similarity search
-    op.execute("""
-        CREATE INDEX ix_rag_chunks_embedding_hnsw
-        ON rag_chunks
-        USING hnsw (embedding vector_cosine_ops)
-    """)
+    # The HNSW index is built separately (see build_rag_chunks_hnsw) so that
+    # bulk loads do not pay an incremental graph update per inserted row.
 
     # Create rag_conversations table
     op.create_table(
@@ -21,23 +21,33 @@ def upgrade() -> None:
         "rag_messages",
         sa.Column("sequence", sa.Integer(), nullable=True),
     )
-    op.execute(
-        """
-        WITH ranked AS (
-            SELECT
-                id,
-                ROW_NUMBER() OVER (
-                    PARTITION BY conversation_id
-                    ORDER BY created_at, id
-                ) AS seq
-            FROM rag_messages
-        )
-        UPDATE rag_messages
-        SET sequence = ranked.seq
-        FROM ranked
-        WHERE rag_messages.id = ranked.id
-        """
-    )
+    # Number each conversation separately so every sort is bounded by the
+    # conversation size and each UPDATE commits (and releases locks) on its own
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        conversation_ids = conn.execute(
+            sa.text("SELECT DISTINCT conversation_id FROM rag_messages")
+        ).scalars().all()
+        for conversation_id in conversation_ids:
+            conn.execute(
+                sa.text(
+                    """
+                    WITH ranked AS (
+                        SELECT
+                            id,
+                            ROW_NUMBER() OVER (ORDER BY created_at, id) AS seq
+                        FROM rag_messages
+                        WHERE conversation_id = :conversation_id
+                    )
+                    UPDATE rag_messages
+                    SET sequence = ranked.seq
+                    FROM ranked
+                    WHERE rag_messages.id = ranked.id
+                      AND rag_messages.conversation_id = :conversation_id
+                    """
+                ),
+                {"conversation_id": conversation_id},
+            )
     op.alter_column("rag_messages", "sequence", nullable=False)
     op.create_unique_constraint(
         op.f("uq_rag_messages_conversation_id_sequence"),
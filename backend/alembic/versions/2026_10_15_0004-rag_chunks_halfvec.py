@@ -0,0 +1,39 @@
+"""Store RAG chunk embeddings as halfvec
+
+Revision ID: rag_chunks_halfvec
+Revises: add_rag_message_sequence
+Create Date: 2026-10-15 00:04:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "rag_chunks_halfvec"
+down_revision = "add_rag_message_sequence"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_rag_chunks_embedding_hnsw")
+
+    # halfvec halves the bytes read per vector during HNSW graph traversal
+    op.execute(
+        """
+        ALTER TABLE rag_chunks
+        ALTER COLUMN embedding TYPE halfvec(768)
+        USING embedding::halfvec(768)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_rag_chunks_embedding_hnsw")
+    op.execute(
+        """
+        ALTER TABLE rag_chunks
+        ALTER COLUMN embedding TYPE vector(768)
+        USING embedding::vector(768)
+        """
+    )
@@ -0,0 +1,37 @@
+"""Build the HNSW index on RAG chunk embeddings
+
+Revision ID: build_rag_chunks_hnsw
+Revises: rag_chunks_halfvec
+Create Date: 2026-10-15 00:05:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "build_rag_chunks_hnsw"
+down_revision = "rag_chunks_halfvec"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute("SET max_parallel_maintenance_workers = 7")
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_rag_chunks_embedding_hnsw
+            ON rag_chunks
+            USING hnsw (embedding halfvec_cosine_ops)
+            WITH (m = 24, ef_construction = 128)
+            """
+        )
+        op.execute("RESET maintenance_work_mem")
+        op.execute("RESET max_parallel_maintenance_workers")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_rag_chunks_embedding_hnsw")
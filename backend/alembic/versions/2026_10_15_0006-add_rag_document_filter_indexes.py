@@ -0,0 +1,45 @@
+"""Add composite and partial indexes for RAG document filters
+
+Revision ID: add_rag_document_filter_indexes
+Revises: build_rag_chunks_hnsw
+Create Date: 2026-10-15 00:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "add_rag_document_filter_indexes"
+down_revision = "build_rag_chunks_hnsw"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_rag_documents_folder_status",
+        "rag_documents",
+        ["folder_path", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_rag_documents_pending",
+        "rag_documents",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    # folder_path is the leading column of the composite index
+    op.drop_index(op.f("ix_rag_documents_folder_path"), table_name="rag_documents")
+
+
+def downgrade() -> None:
+    op.create_index(
+        op.f("ix_rag_documents_folder_path"),
+        "rag_documents",
+        ["folder_path"],
+        unique=False,
+    )
+    op.drop_index("ix_rag_documents_pending", table_name="rag_documents")
+    op.drop_index("ix_rag_documents_folder_status", table_name="rag_documents")
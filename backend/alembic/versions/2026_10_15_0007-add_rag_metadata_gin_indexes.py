@@ -0,0 +1,41 @@
+"""Add GIN indexes on RAG metadata columns
+
+Revision ID: add_rag_metadata_gin_indexes
+Revises: add_rag_document_filter_indexes
+Create Date: 2026-10-15 00:07:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "add_rag_metadata_gin_indexes"
+down_revision = "add_rag_document_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops only supports @> but is about half the size of the
+    # default jsonb_ops; built concurrently so live tables stay writable
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_rag_documents_metadata_gin
+            ON rag_documents
+            USING gin (metadata jsonb_path_ops)
+            """
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_rag_chunks_metadata_gin
+            ON rag_chunks
+            USING gin (metadata jsonb_path_ops)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_rag_chunks_metadata_gin")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_rag_documents_metadata_gin")
@@ -0,0 +1,120 @@
+"""Hash-partition rag_messages by conversation_id
+
+Revision ID: partition_rag_messages
+Revises: add_rag_metadata_gin_indexes
+Create Date: 2026-10-15 00:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "partition_rag_messages"
+down_revision = "add_rag_metadata_gin_indexes"
+branch_labels = None
+depends_on = None
+
+PARTITION_COUNT = 16
+
+COLUMNS = (
+    "id, conversation_id, sequence, role, content, sources, "
+    "token_count, created_at, updated_at"
+)
+
+
+def _message_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("conversation_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(length=20), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("sources", postgresql.JSONB(astext_type=sa.Text()), server_default="[]", nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _foreign_key() -> sa.ForeignKeyConstraint:
+    return sa.ForeignKeyConstraint(
+        ["conversation_id"],
+        ["rag_conversations.id"],
+        name=op.f("fk_rag_messages_conversation_id_rag_conversations"),
+        ondelete="CASCADE",
+    )
+
+
+def _unique_sequence() -> sa.UniqueConstraint:
+    return sa.UniqueConstraint(
+        "conversation_id",
+        "sequence",
+        name=op.f("uq_rag_messages_conversation_id_sequence"),
+    )
+
+
+def _strip_old_table() -> None:
+    """Rename rag_messages aside and free its constraint/index names."""
+    op.rename_table("rag_messages", "rag_messages_old")
+    op.drop_constraint(
+        op.f("uq_rag_messages_conversation_id_sequence"),
+        "rag_messages_old",
+        type_="unique",
+    )
+    op.drop_constraint(
+        op.f("fk_rag_messages_conversation_id_rag_conversations"),
+        "rag_messages_old",
+        type_="foreignkey",
+    )
+    op.drop_constraint(op.f("pk_rag_messages"), "rag_messages_old", type_="primary")
+
+
+def upgrade() -> None:
+    _strip_old_table()
+    op.drop_index(op.f("ix_rag_messages_conversation_id"), table_name="rag_messages_old")
+
+    # The partition key must be part of the primary key; the unique
+    # (conversation_id, sequence) constraint also serves conversation lookups
+    op.create_table(
+        "rag_messages",
+        *_message_columns(),
+        _foreign_key(),
+        _unique_sequence(),
+        sa.PrimaryKeyConstraint("id", "conversation_id", name=op.f("pk_rag_messages")),
+        postgresql_partition_by="HASH (conversation_id)",
+    )
+    for remainder in range(PARTITION_COUNT):
+        op.execute(
+            f"""
+            CREATE TABLE rag_messages_p{remainder}
+            PARTITION OF rag_messages
+            FOR VALUES WITH (MODULUS {PARTITION_COUNT}, REMAINDER {remainder})
+            """
+        )
+
+    op.execute(f"INSERT INTO rag_messages ({COLUMNS}) SELECT {COLUMNS} FROM rag_messages_old")
+    op.drop_table("rag_messages_old")
+
+
+def downgrade() -> None:
+    _strip_old_table()
+
+    op.create_table(
+        "rag_messages",
+        *_message_columns(),
+        _foreign_key(),
+        _unique_sequence(),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_rag_messages")),
+    )
+    op.create_index(
+        op.f("ix_rag_messages_conversation_id"),
+        "rag_messages",
+        ["conversation_id"],
+        unique=False,
+    )
+
+    op.execute(f"INSERT INTO rag_messages ({COLUMNS}) SELECT {COLUMNS} FROM rag_messages_old")
+    # Dropping the partitioned parent drops all of its partitions
+    op.drop_table("rag_messages_old")
@@ -0,0 +1,38 @@
+"""Scope RAG document file name uniqueness to the folder
+
+Revision ID: rag_documents_unique_per_folder
+Revises: partition_rag_messages
+Create Date: 2026-10-15 00:09:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "rag_documents_unique_per_folder"
+down_revision = "partition_rag_messages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint(
+        op.f("uq_rag_documents_file_name"),
+        "rag_documents",
+        type_="unique",
+    )
+    op.create_index(
+        "uq_rag_documents_folder_file",
+        "rag_documents",
+        ["folder_path", "file_name"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_rag_documents_folder_file", table_name="rag_documents")
+    op.create_unique_constraint(
+        op.f("uq_rag_documents_file_name"),
+        "rag_documents",
+        ["file_name"],
+    )
@@ -4,24 +4,28 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import settings
+from app.helpers.postgres import postgres_helper
+from app.helpers.redis_helper import redis_helper
+from app.services.feature_flag_service import FeatureFlagService
 
+# Optional drivers are only importable when their extra is installed
+if settings.enable_mongodb:
+    from app.helpers.mongodb import mongodb_helper
+
+if settings.enable_neo4j:
+    from app.helpers.neo4j_helper import neo4j_helper
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    from app.helpers.postgres import postgres_helper
 
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with postgres_helper.get_session() as session:
         yield session
 
 
 async def get_feature_flag_service(db: AsyncSession = Depends(get_db)):
-    from app.services.feature_flag_service import FeatureFlagService
-
     return FeatureFlagService(db)
 
 
 async def get_redis():
-    from app.helpers.redis_helper import redis_helper
-
     return redis_helper.get_client()
 
 
@@ -32,8 +36,6 @@ async def get_mongodb():
             detail="MongoDB is not enabled",
         )
 
-    from app.helpers.mongodb import mongodb_helper
-
     return mongodb_helper.get_database()
 
 
@@ -44,8 +46,6 @@ async def get_neo4j():
             detail="Neo4j is not enabled",
         )
 
-    from app.helpers.neo4j_helper import neo4j_helper
-
     return neo4j_helper.get_driver()
 
 
@@ -57,7 +57,6 @@ async def get_neo4j_session():
             detail="Neo4j is not enabled",
         )
 
-    from app.helpers.neo4j_helper import neo4j_helper
-
-    async with neo4j_helper.get_session() as session:
+    # Helper calls made while handling the request share this session
+    async with neo4j_helper.session_scope() as session:
         yield session
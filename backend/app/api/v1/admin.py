@@ -4,58 +4,64 @@ Admin endpoints for feature flags and system configuration.
 
 from typing import Any, Dict
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.helpers.postgres import postgres_helper
+from app.api.deps import get_feature_flag_service
 from app.schemas.feature_flag import FeatureFlagUpdate
 from app.services.feature_flag_service import FeatureFlagService
+from app.services.rag.index_maintenance import (
+    HNSW_INDEX_NAME,
+    drop_hnsw_index,
+    rebuild_hnsw_index,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/feature-flags")
 async def get_feature_flags(
-    category: str | None = Query(None, description="Filter by category")
+    category: str | None = Query(None, description="Filter by category"),
+    service: FeatureFlagService = Depends(get_feature_flag_service),
 ) -> Dict[str, Any]:
     """
     Get all feature flags, optionally filtered by category.
 
     Args:
         category: Optional category filter
+        service: Feature flag service
 
     Returns:
         List of feature flags with total count
     """
-    async with postgres_helper.get_session() as session:
-        service = FeatureFlagService(session)
-        flags = await service.get_all_flags(category=category)
-
-        # Convert to dict format
-        flags_data = [
-            {
-                "id": flag.id,
-                "key": flag.key,
-                "name": flag.name,
-                "description": flag.description,
-                "category": flag.category,
-                "enabled": flag.enabled,
-                "metadata": flag.config,
-                "created_at": flag.created_at.isoformat() if flag.created_at else None,
-                "updated_at": flag.updated_at.isoformat() if flag.updated_at else None,
-            }
-            for flag in flags
-        ]
-
-        return {
-            "flags": flags_data,
-            "total": len(flags_data),
+    flags = await service.list_flags_projection(category=category)
+
+    # Convert to dict format
+    flags_data = [
+        {
+            "id": flag["id"],
+            "key": flag["key"],
+            "name": flag["name"],
+            "description": flag["description"],
+            "category": flag["category"],
+            "enabled": flag["enabled"],
+            "metadata": flag["config"],
+            "created_at": flag["created_at"].isoformat() if flag["created_at"] else None,
+            "updated_at": flag["updated_at"].isoformat() if flag["updated_at"] else None,
         }
+        for flag in flags
+    ]
+
+    return {
+        "flags": flags_data,
+        "total": len(flags_data),
+    }
 
 
 @router.patch("/feature-flags/{key}")
 async def update_feature_flag(
     key: str,
     update: FeatureFlagUpdate,
+    service: FeatureFlagService = Depends(get_feature_flag_service),
 ) -> Dict[str, Any]:
     """
     Update a feature flag.
@@ -63,6 +69,7 @@ async def update_feature_flag(
     Args:
         key: Feature flag key
         update: Update data
+        service: Feature flag service
 
     Returns:
         Updated feature flag
@@ -70,21 +77,45 @@ async def update_feature_flag(
     Raises:
         HTTPException: If feature flag not found
     """
-    async with postgres_helper.get_session() as session:
-        service = FeatureFlagService(session)
-        flag = await service.update_flag(key, update)
-
-        if not flag:
-            raise HTTPException(status_code=404, detail=f"Feature flag '{key}' not found")
-
-        return {
-            "id": flag.id,
-            "key": flag.key,
-            "name": flag.name,
-            "description": flag.description,
-            "category": flag.category,
-            "enabled": flag.enabled,
-            "metadata": flag.config,
-            "created_at": flag.created_at.isoformat() if flag.created_at else None,
-            "updated_at": flag.updated_at.isoformat() if flag.updated_at else None,
-        }
+    flag = await service.update_flag(key, update)
+
+    if not flag:
+        raise HTTPException(status_code=404, detail=f"Feature flag '{key}' not found")
+
+    return {
+        "id": flag.id,
+        "key": flag.key,
+        "name": flag.name,
+        "description": flag.description,
+        "category": flag.category,
+        "enabled": flag.enabled,
+        "metadata": flag.config,
+        "created_at": flag.created_at.isoformat() if flag.created_at else None,
+        "updated_at": flag.updated_at.isoformat() if flag.updated_at else None,
+    }
+
+
+@router.delete("/rag/hnsw-index")
+async def drop_rag_hnsw_index() -> Dict[str, Any]:
+    """
+    Drop the HNSW index on RAG chunk embeddings.
+
+    Call before a large ingest and rebuild afterwards.
+
+    Returns:
+        Dropped index name
+    """
+    await drop_hnsw_index()
+    return {"success": True, "index": HNSW_INDEX_NAME}
+
+
+@router.post("/rag/hnsw-index/rebuild")
+async def rebuild_rag_hnsw_index() -> Dict[str, Any]:
+    """
+    Rebuild the HNSW index on RAG chunk embeddings.
+
+    Returns:
+        Rebuilt index name
+    """
+    await rebuild_hnsw_index()
+    return {"success": True, "index": HNSW_INDEX_NAME}
@@ -75,7 +75,7 @@ async def get_document(
 
 @router.get("/", response_model=DocumentList)
 async def list_documents(
-    skip: int = Query(default=0, ge=0),
+    after: str | None = Query(default=None, description="Cursor from a previous page"),
     limit: int = Query(default=10, ge=1, le=100),
     db: AsyncIOMotorDatabase = Depends(get_mongodb),
 ):
@@ -83,23 +83,29 @@ async def list_documents(
     List all documents.
 
     Args:
-        skip: Number of documents to skip
+        after: ID of the last document on the previous page
         limit: Maximum number of documents to return
         db: MongoDB database
 
     Returns:
-        List of documents
+        List of documents with the cursor for the next page
     """
     service = DocumentService(db)
 
-    documents = await service.repository.find_all(skip=skip, limit=limit)
+    try:
+        documents = await service.repository.find_all(after=after, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     total = await service.repository.count_all()
 
     return DocumentList(
         documents=documents,
         total=total,
-        page=skip // limit + 1,
         page_size=limit,
+        next_cursor=documents[-1]["_id"] if len(documents) == limit else None,
     )
 
 
@@ -122,15 +128,14 @@ async def update_document(
     """
     service = DocumentService(db)
 
-    # Check if exists
-    existing = await service.get_document(document_id)
-    if not existing:
+    # find_one_and_update returns None when nothing matched
+    updated = await service.update_document(document_id, document)
+    if not updated:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found",
         )
 
-    updated = await service.update_document(document_id, document)
     return updated
 
 
@@ -148,19 +153,12 @@ async def delete_document(
     """
     service = DocumentService(db)
 
-    # Check if exists
-    existing = await service.get_document(document_id)
-    if not existing:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
-
+    # deleted_count is 0 when the document does not exist
     deleted = await service.delete_document(document_id)
     if not deleted:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete document",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
         )
 
 
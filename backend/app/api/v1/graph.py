@@ -157,28 +157,19 @@ async def get_neighbors(
     """
     service = GraphService(session)
 
-    # Get center node
-    center_node = await service.get_node(query.node_id)
-    if not center_node:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Node not found",
-        )
-
-    # Get neighbors
-    result = await service.get_neighbors(
+    result = await service.get_node_with_neighbors(
         query.node_id,
         query.relationship_types,
         query.direction,
         query.depth,
     )
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Node not found",
+        )
 
-    return NeighborsResponse(
-        center_node=center_node,
-        neighbors=result["neighbors"],
-        relationships=[],  # TODO: Include actual relationships
-        total=result["total"],
-    )
+    return NeighborsResponse(**result)
 
 
 @router.post("/query")
@@ -195,6 +186,15 @@ async def execute_query(
 
     Returns:
         Query results
+
+    Raises:
+        HTTPException: If the query inlines node IDs
     """
     service = GraphService(session)
-    return await service.execute_query(query.query, query.parameters)
+    try:
+        return await service.execute_query(query.query, query.parameters)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
@@ -2,11 +2,12 @@
 Service health check endpoints.
 """
 
+import asyncio
 import time
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict
 
+import httpx
 from fastapi import APIRouter
-from sqlalchemy import text
 
 from app.config.settings import settings
 from app.helpers.postgres import postgres_helper
@@ -14,13 +15,43 @@ from app.helpers.redis_helper import redis_helper
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Upper bound for a single probe so one hung service can't stall the endpoint
+HEALTH_CHECK_TIMEOUT = 2.0
+
+# Probe results are shared for this long, so frequent liveness polling doesn't
+# open fresh connections on every request
+HEALTH_CACHE_TTL = 3.0
+
+_health_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+_health_locks: Dict[str, asyncio.Lock] = {}
+
+# Shared so repeated Ollama probes reuse a keep-alive connection
+_ollama_client: httpx.AsyncClient | None = None
+
+
+async def _get_ollama_client() -> httpx.AsyncClient:
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4),
+            timeout=5.0,
+        )
+    return _ollama_client
+
+
+async def close_ollama_client() -> None:
+    """Close the shared Ollama probe client (called on shutdown)."""
+    global _ollama_client
+    if _ollama_client is not None:
+        await _ollama_client.aclose()
+        _ollama_client = None
+
 
 async def check_postgres() -> Dict[str, Any]:
     """Check PostgreSQL health."""
     try:
         start = time.time()
-        async with postgres_helper.get_session() as session:
-            await session.execute(text("SELECT 1"))
+        await postgres_helper.ping()
         latency = round((time.time() - start) * 1000, 2)
 
         return {
@@ -146,11 +177,10 @@ async def check_ollama() -> Dict[str, Any]:
         }
 
     try:
-        import httpx
         start = time.time()
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{settings.ollama_host}/api/tags", timeout=5.0)
-            response.raise_for_status()
+        client = await _get_ollama_client()
+        response = await client.get(f"{settings.ollama_host}/api/tags")
+        response.raise_for_status()
         latency = round((time.time() - start) * 1000, 2)
 
         return {
@@ -166,6 +196,45 @@ async def check_ollama() -> Dict[str, Any]:
         }
 
 
+def _get_cached_check(name: str) -> Dict[str, Any] | None:
+    cached = _health_cache.get(name)
+    if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+async def run_check(
+    name: str, check: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Run a health check, reporting a timeout as unhealthy.
+
+    Results are cached for HEALTH_CACHE_TTL seconds and concurrent callers
+    wait on a single in-flight probe instead of each starting their own.
+    """
+    cached = _get_cached_check(name)
+    if cached is not None:
+        return cached
+
+    lock = _health_locks.setdefault(name, asyncio.Lock())
+    async with lock:
+        cached = _get_cached_check(name)
+        if cached is not None:
+            return cached
+
+        try:
+            result = await asyncio.wait_for(check(), timeout=HEALTH_CHECK_TIMEOUT)
+        except asyncio.TimeoutError:
+            result = {
+                "status": "unhealthy",
+                "error": f"Timed out after {HEALTH_CHECK_TIMEOUT}s",
+                "message": f"{name} health check timed out"
+            }
+
+        _health_cache[name] = (time.monotonic(), result)
+        return result
+
+
 @router.get("/services")
 async def get_services_health() -> Dict[str, Any]:
     """
@@ -179,23 +248,29 @@ async def get_services_health() -> Dict[str, Any]:
     - RabbitMQ (if enabled)
     - Ollama (if enabled)
     """
-    health_checks = {
-        "postgres": await check_postgres(),
-        "redis": await check_redis(),
+    checks = {
+        "postgres": check_postgres,
+        "redis": check_redis,
     }
 
     # Only check optional services if they're enabled
     if settings.enable_mongodb:
-        health_checks["mongodb"] = await check_mongodb()
+        checks["mongodb"] = check_mongodb
 
     if settings.enable_neo4j:
-        health_checks["neo4j"] = await check_neo4j()
+        checks["neo4j"] = check_neo4j
 
     if settings.enable_rabbitmq:
-        health_checks["rabbitmq"] = await check_rabbitmq()
+        checks["rabbitmq"] = check_rabbitmq
 
     if settings.enable_llm_ollama:
-        health_checks["ollama"] = await check_ollama()
+        checks["ollama"] = check_ollama
+
+    # Probes are independent, so total latency is the slowest one, not the sum
+    results = await asyncio.gather(
+        *(run_check(name, check) for name, check in checks.items())
+    )
+    health_checks = dict(zip(checks, results))
 
     # Determine overall status
     statuses = [check["status"] for check in health_checks.values()]
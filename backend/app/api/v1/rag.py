@@ -1,13 +1,16 @@
-import json
+import inspect
 import logging
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
+from app.config.settings import settings
 from app.schemas.rag import (
     ChatRequest,
     ChatResponse,
@@ -17,24 +20,81 @@ from app.schemas.rag import (
     DocumentStatus,
     FolderContents,
 )
-from app.services.rag.rag_service import RagService
+from app.services.rag.rag_service import RagClients, RagService, get_rag_clients
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/rag", tags=["rag"])
 
 
-def get_rag_service(session: AsyncSession = Depends(get_db)) -> RagService:
-    return RagService(session)
+def get_rag_service(
+    session: AsyncSession = Depends(get_db),
+    clients: RagClients = Depends(get_rag_clients),
+) -> RagService:
+    return RagService(session, clients)
 
 
-@router.get("/documents/folder", response_model=FolderContents)
+class EventSourceResponse(StreamingResponse):
+    media_type = "text/event-stream"
+
+    def __init__(self, content: Any, **kwargs: Any) -> None:
+        # Disable proxy buffering so each frame is flushed as it is yielded
+        headers = {
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            **(kwargs.pop("headers", None) or {}),
+        }
+        super().__init__(content, headers=headers, **kwargs)
+
+
+# Static error frames, encoded once instead of on every failure
+INGEST_INTERNAL_ERROR_FRAME = b'data: {"type":"error","error":"Internal error during ingestion"}\n\n'
+CHAT_INTERNAL_ERROR_FRAME = b'data: {"type":"error","error":"Internal error during chat"}\n\n'
+
+STREAM_SOURCE_FIELDS = {
+    "sources": {"__all__": {"document_name", "chunk_content", "relevance_score"}}
+}
+
+
+def _sse(obj: Any) -> bytes:
+    return b"data: " + orjson.dumps(obj, default=str) + b"\n\n"
+
+
+# Compiled serializers: pydantic-core writes JSON bytes straight from the
+# models, without building intermediate dicts for a second encoder
+FOLDER_CONTENTS_JSON = TypeAdapter(FolderContents)
+DOCUMENT_STATUSES_JSON = TypeAdapter(list[DocumentStatus])
+CHAT_RESPONSE_JSON = TypeAdapter(ChatResponse)
+CONVERSATION_SUMMARY_JSON = TypeAdapter(ConversationSummary)
+CONVERSATION_DETAIL_JSON = TypeAdapter(ConversationDetail)
+
+
+def _json_response(adapter: TypeAdapter, value: Any) -> Response:
+    return Response(adapter.dump_json(value), media_type="application/json")
+
+
+async def _stream_json_array(
+    adapter: TypeAdapter, items: AsyncIterator[Any]
+) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = b""
+    async for item in items:
+        yield separator + adapter.dump_json(item)
+        separator = b","
+    yield b"]"
+
+
+@router.get(
+    "/documents/folder",
+    response_model=FolderContents,
+)
 async def list_folder_documents(
     folder_path: str = Query(..., description="Path to the folder"),
     rag_service: RagService = Depends(get_rag_service),
-) -> FolderContents:
+) -> Response:
     try:
-        return await rag_service.list_folder(folder_path)
+        contents = await rag_service.list_folder(folder_path)
+        return _json_response(FOLDER_CONTENTS_JSON, contents)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,35 +106,38 @@ async def list_folder_documents(
 async def ingest_folder_documents(
     request: DocumentIngestRequest,
     rag_service: RagService = Depends(get_rag_service),
-) -> StreamingResponse:
+) -> EventSourceResponse:
+    progress_stream = rag_service.ingest_folder(
+        request.folder_path, batch_size=request.batch_size
+    )
+    # A sync iterator would make Starlette iterate it in a threadpool
+    if settings.app_debug:
+        assert inspect.isasyncgen(progress_stream)
+
     async def event_generator():
         try:
-            async for progress in rag_service.ingest_folder(request.folder_path):
-                yield f"data: {json.dumps(progress)}\n\n"
+            async for progress in progress_stream:
+                yield _sse(progress)
         except ValueError as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield _sse({"type": "error", "error": str(e)})
         except Exception as e:
-            logger.error(f"Ingestion error: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'error': 'Internal error during ingestion'})}\n\n"
+            logger.error("Ingestion error: %s", e)
+            yield INGEST_INTERNAL_ERROR_FRAME
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return EventSourceResponse(event_generator())
 
 
-@router.get("/documents/status", response_model=list[DocumentStatus])
+@router.get(
+    "/documents/status",
+    response_model=list[DocumentStatus],
+)
 async def get_document_status(
     folder_path: str = Query(..., description="Path to the folder"),
     rag_service: RagService = Depends(get_rag_service),
-) -> list[DocumentStatus]:
+) -> Response:
     try:
-        return await rag_service.get_document_status(folder_path)
+        statuses = await rag_service.get_document_status(folder_path)
+        return _json_response(DOCUMENT_STATUSES_JSON, statuses)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -86,13 +149,14 @@ async def get_document_status(
 async def chat(
     request: ChatRequest,
     rag_service: RagService = Depends(get_rag_service),
-) -> ChatResponse:
+) -> Response:
     try:
-        return await rag_service.chat(
+        response = await rag_service.chat(
             message=request.message,
             conversation_id=request.conversation_id,
             folder_path=request.folder_path,
         )
+        return _json_response(CHAT_RESPONSE_JSON, response)
     except LookupError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -109,7 +173,7 @@ async def chat(
 async def chat_stream(
     request: ChatRequest,
     rag_service: RagService = Depends(get_rag_service),
-) -> StreamingResponse:
+) -> EventSourceResponse:
     async def event_generator():
         try:
             response = await rag_service.chat(
@@ -118,35 +182,26 @@ async def chat_stream(
                 folder_path=request.folder_path,
             )
 
-            sources_data = [
-                {
-                    "document_name": s.document_name,
-                    "chunk_content": s.chunk_content,
-                    "relevance_score": s.relevance_score,
-                }
-                for s in response.sources
-            ]
-            yield f"data: {json.dumps({'type': 'sources', 'sources': sources_data})}\n\n"
-            yield f"data: {json.dumps({'type': 'message', 'content': response.message})}\n\n"
-            yield f"data: {json.dumps({'type': 'done', 'conversation_id': str(response.conversation_id)})}\n\n"
+            # Encode every frame before the first yield so a serialization
+            # failure surfaces as an error event, not a truncated stream
+            sources_data = response.model_dump(include=STREAM_SOURCE_FIELDS)["sources"]
+            frames = (
+                _sse({"type": "sources", "sources": sources_data}),
+                _sse({"type": "message", "content": response.message}),
+                _sse({"type": "done", "conversation_id": response.conversation_id}),
+            )
+            for frame in frames:
+                yield frame
 
         except LookupError as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield _sse({"type": "error", "error": str(e)})
         except ValueError as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield _sse({"type": "error", "error": str(e)})
         except Exception as e:
-            logger.error(f"Chat stream error: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'error': 'Internal error during chat'})}\n\n"
+            logger.error("Chat stream error: %s", e)
+            yield CHAT_INTERNAL_ERROR_FRAME
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return EventSourceResponse(event_generator())
 
 
 # ============================================================================
@@ -154,29 +209,44 @@ async def chat_stream(
 # ============================================================================
 
 
-@router.get("/conversations", response_model=list[ConversationSummary])
+@router.get(
+    "/conversations",
+    response_model=list[ConversationSummary],
+    response_class=StreamingResponse,
+)
 async def list_conversations(
     limit: int = Query(20, ge=1, le=100, description="Max conversations to return"),
     rag_service: RagService = Depends(get_rag_service),
-) -> list[ConversationSummary]:
+) -> StreamingResponse:
     """
     List recent conversations.
 
-    Returns conversation summaries ordered by creation date (newest first).
+    Returns conversation summaries ordered by creation date (newest first),
+    streamed as a JSON array while rows are read from the database.
     """
-    return await rag_service.list_conversations(limit=limit)
+    return StreamingResponse(
+        _stream_json_array(
+            CONVERSATION_SUMMARY_JSON,
+            rag_service.list_conversations_stream(limit=limit),
+        ),
+        media_type="application/json",
+    )
 
 
-@router.get("/conversations/{conversation_id}", response_model=ConversationDetail)
+@router.get(
+    "/conversations/{conversation_id}",
+    response_model=ConversationDetail,
+)
 async def get_conversation(
     conversation_id: UUID,
     rag_service: RagService = Depends(get_rag_service),
-) -> ConversationDetail:
+) -> Response:
     """
     Get a conversation with all its messages.
     """
     try:
-        return await rag_service.get_conversation(conversation_id)
+        conversation = await rag_service.get_conversation(conversation_id)
+        return _json_response(CONVERSATION_DETAIL_JSON, conversation)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
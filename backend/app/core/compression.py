@@ -0,0 +1,39 @@
+"""
+Response compression middleware.
+
+Gzips HTTP responses except on streaming endpoints whose events must reach
+the client as soon as they are written.
+"""
+
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class SelectiveGZipMiddleware:
+    """
+    GZip middleware that skips excluded paths.
+
+    Gzip buffers output inside the compressor, which would hold back
+    server-sent events until enough bytes accumulate.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        excluded_paths: Iterable[str] = (),
+        minimum_size: int = 1024,
+        compresslevel: int = 5,
+    ) -> None:
+        self.app = app
+        self.gzip_app = GZipMiddleware(
+            app, minimum_size=minimum_size, compresslevel=compresslevel
+        )
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] not in self.excluded_paths:
+            await self.gzip_app(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -6,10 +6,30 @@ Provides structured logging with proper formatting and log levels.
 
 import logging
 import sys
+from datetime import datetime, timezone
 from typing import Any
 
+import orjson
+
 from app.config.settings import settings
 
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class JSONFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
 
 def setup_logging() -> None:
     """
@@ -18,16 +38,22 @@ def setup_logging() -> None:
     Sets up:
     - Log level from settings
     - Console handler with formatting
-    - JSON formatting for production (optional)
+    - JSON formatting when LOG_FORMAT=json
     """
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
+    handler = logging.StreamHandler(sys.stdout)
+    if settings.log_format.lower() == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
     # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
+    logging.basicConfig(level=log_level, handlers=[handler])
+
+    # Don't print tracebacks for failures inside logging itself in production
+    if settings.app_env == "production":
+        logging.raiseExceptions = False
 
     # Set third-party loggers to WARNING to reduce noise
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
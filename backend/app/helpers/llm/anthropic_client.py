@@ -8,15 +8,22 @@ Use this for Claude-specific features:
 - Streaming
 """
 
-from typing import Any, AsyncIterator, Dict, List, Optional
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
-try:
+# The SDK itself is imported on first use
+ANTHROPIC_AVAILABLE = find_spec("anthropic") is not None
+
+if TYPE_CHECKING:
     from anthropic import AsyncAnthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
 
 from app.config.settings import settings
+from app.helpers.llm.response_cache import (
+    TokenCountCache,
+    build_response_cache,
+    cache_for_call,
+)
+from app.helpers.llm.streaming import coalesce_stream
 
 
 class AnthropicClient:
@@ -24,18 +31,26 @@ class AnthropicClient:
 
     def __init__(self):
         self.enabled = settings.enable_llm_anthropic and ANTHROPIC_AVAILABLE
+        self._key_ok = bool(settings.anthropic_api_key)
         self._client = None
+        # Anthropic has no embeddings endpoint, so only the exact tier applies
+        self._cache = build_response_cache("anthropic")
+        self._token_counts = TokenCountCache()
 
     def _get_client(self) -> "AsyncAnthropic":
         """Get or create Anthropic client."""
+        if self._client is not None:
+            return self._client
+
         if not self.enabled:
             raise RuntimeError("Anthropic is not enabled or not installed")
 
-        if not settings.anthropic_api_key:
+        if not self._key_ok:
             raise RuntimeError("Anthropic API key is not configured")
 
-        if self._client is None:
-            self._client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+        from anthropic import AsyncAnthropic
+
+        self._client = AsyncAnthropic(api_key=settings.anthropic_api_key)
         return self._client
 
     async def complete(
@@ -45,6 +60,7 @@ class AnthropicClient:
         system: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        cache: bool = True,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -55,7 +71,9 @@ class AnthropicClient:
             model: Model identifier (claude-3-opus, claude-3-sonnet, claude-3-haiku)
             system: Optional system prompt
             max_tokens: Maximum tokens to generate
-            temperature: Sampling temperature (0-1)
+            temperature: Sampling temperature (0-1); only temperature 0
+                responses are cached
+            cache: Set False to bypass the response cache for this call
             **kwargs: Additional parameters
 
         Returns:
@@ -73,9 +91,15 @@ class AnthropicClient:
 
         kwargs_clean.update(kwargs)
 
+        response_cache = cache_for_call(self._cache, temperature, cache)
+        if response_cache is not None:
+            cached, _ = await response_cache.get(kwargs_clean)
+            if cached is not None:
+                return cached
+
         response = await client.messages.create(**kwargs_clean)
 
-        return {
+        result = {
             "content": response.content[0].text,
             "model": response.model,
             "usage": {
@@ -85,6 +109,11 @@ class AnthropicClient:
             "stop_reason": response.stop_reason,
         }
 
+        if response_cache is not None:
+            await response_cache.set(kwargs_clean, result)
+
+        return result
+
     async def stream(
         self,
         messages: List[Dict[str, str]],
@@ -126,7 +155,7 @@ class AnthropicClient:
         kwargs_clean.update(kwargs)
 
         async with client.messages.stream(**kwargs_clean) as stream:
-            async for text in stream.text_stream:
+            async for text in coalesce_stream(stream.text_stream):
                 yield text
 
     async def count_tokens(self, text: str) -> int:
@@ -140,14 +169,17 @@ class AnthropicClient:
             Approximate token count
         """
         client = self._get_client()
+        model = "claude-3-sonnet-20240229"
 
-        # Anthropic's token counting
-        response = await client.messages.count_tokens(
-            model="claude-3-sonnet-20240229",
-            messages=[{"role": "user", "content": text}],
-        )
+        async def count() -> int:
+            # Anthropic's token counting
+            response = await client.messages.count_tokens(
+                model=model,
+                messages=[{"role": "user", "content": text}],
+            )
+            return response.input_tokens
 
-        return response.input_tokens
+        return await self._token_counts.get_or_count(model, text, count)
 
 
 # Global instance
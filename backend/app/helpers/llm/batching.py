@@ -0,0 +1,100 @@
+"""
+Micro-batching for concurrent LLM requests.
+
+Requests arriving within a short window are collected and handed to a
+dispatch function together, so providers that accept batches (or servers
+that batch concurrent requests, like Ollama) see them at once instead of
+trickling in one by one.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+BatchHandler = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class BatchScheduler:
+    """
+    Coalesce concurrent submissions into batches.
+
+    Args:
+        handler: Async function taking a list of requests and returning a
+            list of results (or exceptions) in the same order
+        window_ms: How long to wait for more requests after the first one
+        max_batch: Maximum number of requests per batch
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        window_ms: float = 10.0,
+        max_batch: int = 32,
+    ):
+        self.handler = handler
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def submit(self, request: Any) -> Any:
+        """Queue a request and wait for its result."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            # Dispatch without awaiting so the next window opens immediately
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        requests = [request for request, _ in batch]
+        try:
+            results = await self.handler(requests)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Stop the worker; requests already dispatched run to completion."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
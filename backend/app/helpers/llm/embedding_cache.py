@@ -0,0 +1,104 @@
+"""
+Two-tier cache for text embeddings.
+
+- In-process LRU keyed by (model, sha256(text))
+- Redis, shared across workers, storing vectors as packed float32 bytes
+  under emb:{model}:{sha256(text)} with a TTL
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.config.settings import settings
+from app.core.logging import get_logger
+from app.helpers.redis_helper import redis_helper
+
+logger = get_logger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Embedding cache with a local LRU in front of Redis.
+
+    Args:
+        max_local_entries: Size of the in-process LRU
+        ttl_seconds: Lifetime of Redis entries
+    """
+
+    def __init__(self, max_local_entries: int = 10_000, ttl_seconds: int = 604_800):
+        self.max_local_entries = max_local_entries
+        self.ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[tuple[str, str], List[float]]" = OrderedDict()
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _remember(self, key: tuple[str, str], vector: List[float]) -> None:
+        self._local[key] = vector
+        self._local.move_to_end(key)
+        if len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    async def get_many(
+        self, model: str, texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """Return cached vectors for texts, None where missing."""
+        keys = [(model, self._digest(text)) for text in texts]
+        vectors: List[Optional[List[float]]] = []
+        for key in keys:
+            vector = self._local.get(key)
+            if vector is not None:
+                self._local.move_to_end(key)
+            vectors.append(vector)
+
+        missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+        if not missing:
+            return vectors
+
+        try:
+            client = redis_helper.get_binary_client()
+            raw = await client.mget([f"emb:{model}:{keys[idx][1]}" for idx in missing])
+        except Exception as e:
+            logger.debug(f"Shared embedding cache unavailable: {e}")
+            return vectors
+
+        for idx, blob in zip(missing, raw):
+            if blob is not None:
+                vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                vectors[idx] = vector
+                self._remember(keys[idx], vector)
+        return vectors
+
+    async def set_many(
+        self, model: str, texts: Sequence[str], vectors: Sequence[List[float]]
+    ) -> None:
+        """Store vectors for texts in both tiers."""
+        if not texts:
+            return
+
+        keys = [(model, self._digest(text)) for text in texts]
+        for key, vector in zip(keys, vectors):
+            self._remember(key, vector)
+
+        try:
+            client = redis_helper.get_binary_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for (_, digest), vector in zip(keys, vectors):
+                    pipe.set(
+                        f"emb:{model}:{digest}",
+                        np.asarray(vector, dtype=np.float32).tobytes(),
+                        ex=self.ttl_seconds,
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Shared embedding cache unavailable: {e}")
+
+
+embedding_cache = EmbeddingCache(
+    max_local_entries=settings.embedding_cache_size,
+    ttl_seconds=settings.embedding_cache_ttl,
+)
@@ -8,34 +8,60 @@ Features:
 - Streaming
 """
 
+from importlib.util import find_spec
+from operator import attrgetter
 from typing import Any, AsyncIterator, Dict, List, Optional
 
+# The SDK itself is imported on first use
 try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
+    GEMINI_AVAILABLE = find_spec("google.generativeai") is not None
+except ModuleNotFoundError:
     GEMINI_AVAILABLE = False
 
 from app.config.settings import settings
+from app.helpers.llm.response_cache import TokenCountCache
+from app.helpers.llm.streaming import coalesce_stream
+
+# Gemini calls the assistant role "model"; other roles are not replayed
+GEMINI_ROLE_MAP = {"user": "user", "assistant": "model"}
+
+_RATING_FIELDS = attrgetter("category.name", "probability.name")
+
+# genai.configure sets process-global state; do it once per process
+_GEMINI_CONFIGURED = False
 
 
 class GeminiClient:
     """Google Gemini API client."""
 
     def __init__(self):
+        global _GEMINI_CONFIGURED
         self.enabled = settings.enable_llm_google and GEMINI_AVAILABLE
-        if self.enabled and settings.google_api_key:
+        self._has_key = bool(settings.google_api_key)
+        self._models: Dict[str, Any] = {}
+        self._token_counts = TokenCountCache()
+        if self.enabled and self._has_key and not _GEMINI_CONFIGURED:
+            import google.generativeai as genai
+
             genai.configure(api_key=settings.google_api_key)
+            _GEMINI_CONFIGURED = True
 
     def _get_model(self, model_name: str = "gemini-flash-latest"):
         """Get Gemini model instance."""
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+
         if not self.enabled:
             raise RuntimeError("Gemini is not enabled or not installed")
 
-        if not settings.google_api_key:
+        if not self._has_key:
             raise RuntimeError("Google API key is not configured")
 
-        return genai.GenerativeModel(model_name)
+        import google.generativeai as genai
+
+        model = self._models[model_name] = genai.GenerativeModel(model_name)
+        return model
 
     async def generate_content(
         self,
@@ -76,11 +102,10 @@ class GeminiClient:
             "content": response.text,
             "model": model,
             "safety_ratings": [
-                {
-                    "category": rating.category.name,
-                    "probability": rating.probability.name,
-                }
-                for rating in response.candidates[0].safety_ratings
+                {"category": category, "probability": probability}
+                for category, probability in map(
+                    _RATING_FIELDS, response.candidates[0].safety_ratings
+                )
             ],
             "finish_reason": response.candidates[0].finish_reason.name,
         }
@@ -105,14 +130,12 @@ class GeminiClient:
             Response dict
         """
         model_instance = self._get_model(model)
-        chat = model_instance.start_chat(history=[])
-
-        # Convert messages to Gemini format
-        for msg in messages[:-1]:
-            if msg["role"] == "user":
-                chat.history.append({"role": "user", "parts": [msg["content"]]})
-            elif msg["role"] == "assistant":
-                chat.history.append({"role": "model", "parts": [msg["content"]]})
+        history = [
+            {"role": GEMINI_ROLE_MAP[msg["role"]], "parts": [msg["content"]]}
+            for msg in messages[:-1]
+            if msg["role"] in GEMINI_ROLE_MAP
+        ]
+        chat = model_instance.start_chat(history=history)
 
         # Send last message
         last_message = messages[-1]["content"]
@@ -160,9 +183,9 @@ class GeminiClient:
             **kwargs,
         )
 
-        async for chunk in response:
-            if chunk.text:
-                yield chunk.text
+        texts = (chunk.text async for chunk in response if chunk.text)
+        async for text in coalesce_stream(texts):
+            yield text
 
     async def count_tokens(self, text: str, model: str = "gemini-flash-latest") -> int:
         """
@@ -176,8 +199,12 @@ class GeminiClient:
             Token count
         """
         model_instance = self._get_model(model)
-        result = await model_instance.count_tokens_async(text)
-        return result.total_tokens
+
+        async def count() -> int:
+            result = await model_instance.count_tokens_async(text)
+            return result.total_tokens
+
+        return await self._token_counts.get_or_count(model, text, count)
 
 
 # Global instance
@@ -0,0 +1,45 @@
+"""
+Shared aiohttp session for HTTP-based model backends.
+
+One connector pool serves every client that talks to a model server over
+plain HTTP (Ollama generation and embeddings today), so keep-alive sockets
+and DNS lookups are reused across all of them.
+"""
+
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+_session: Optional[aiohttp.ClientSession] = None
+_lock = asyncio.Lock()
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    if _session is not None and not _session.closed:
+        return _session
+
+    async with _lock:
+        if _session is None or _session.closed:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=200,
+                    limit_per_host=32,
+                    keepalive_timeout=90,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                ),
+                # Local generation can be slow; keep aiohttp's default total
+                timeout=aiohttp.ClientTimeout(total=300, sock_connect=10),
+            )
+    return _session
+
+
+async def close_shared_session() -> None:
+    """Close the shared session (called on application shutdown)."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
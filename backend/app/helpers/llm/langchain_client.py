@@ -10,52 +10,71 @@ Features:
 - RAG (Retrieval Augmented Generation)
 """
 
-from typing import Any, Dict, List, Optional
-
-try:
-    from langchain.chains import ConversationalRetrievalChain, LLMChain
-    from langchain.memory import ConversationBufferMemory
-    from langchain.prompts import PromptTemplate
-    from langchain_community.vectorstores import PGVector
-    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
+import asyncio
+from collections import OrderedDict
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Tuple
+
+# LangChain pulls in a large dependency tree; import it on first use
+LANGCHAIN_AVAILABLE = all(
+    find_spec(package) is not None
+    for package in ("langchain", "langchain_community", "langchain_openai")
+)
 
 from app.config.settings import settings
 
+ADD_DOCUMENTS_BATCH_SIZE = 100
+ADD_DOCUMENTS_CONCURRENCY = 8
+MAX_CONVERSATIONS = 1024
+
 
 class LangChainClient:
     """LangChain integration for complex LLM workflows."""
 
     def __init__(self):
         self.enabled = settings.enable_llm_langchain and LANGCHAIN_AVAILABLE
-        self._llm = None
+        self._can_openai = bool(settings.enable_llm_openai and settings.openai_api_key)
+        self._can_pgvector = bool(settings.enable_postgres and settings.enable_pgvector)
+        self._llms: Dict[tuple, Any] = {}
         self._embeddings = None
-        self._vectorstore = None
+        self._vectorstores: Dict[str, Any] = {}
+        self._rag_chains: Dict[tuple, Any] = {}
+        # Chains are shared across conversations; history is passed per call
+        self._histories: "OrderedDict[str, List[Tuple[str, str]]]" = OrderedDict()
 
     def _get_llm(self, model: str = "gpt-3.5-turbo", temperature: float = 0.7):
         """Get or create LLM instance."""
+        key = (model, temperature)
+        llm = self._llms.get(key)
+        if llm is not None:
+            return llm
+
         if not self.enabled:
             raise RuntimeError("LangChain is not enabled or not installed")
 
-        if not settings.enable_llm_openai or not settings.openai_api_key:
+        if not self._can_openai:
             raise RuntimeError("OpenAI API key is required for LangChain")
 
-        return ChatOpenAI(
+        from langchain_openai import ChatOpenAI
+
+        llm = self._llms[key] = ChatOpenAI(
             model=model,
             temperature=temperature,
             openai_api_key=settings.openai_api_key,
         )
+        return llm
 
     def _get_embeddings(self):
         """Get or create embeddings instance."""
-        if not self.enabled:
-            raise RuntimeError("LangChain is not enabled or not installed")
-
         if self._embeddings is None:
+            if not self.enabled:
+                raise RuntimeError("LangChain is not enabled or not installed")
+
+            from langchain_openai import OpenAIEmbeddings
+
             self._embeddings = OpenAIEmbeddings(
-                openai_api_key=settings.openai_api_key
+                openai_api_key=settings.openai_api_key,
+                chunk_size=ADD_DOCUMENTS_BATCH_SIZE,
             )
         return self._embeddings
 
@@ -69,21 +88,27 @@ class LangChainClient:
         Returns:
             PGVector instance
         """
+        vectorstore = self._vectorstores.get(collection_name)
+        if vectorstore is not None:
+            return vectorstore
+
         if not self.enabled:
             raise RuntimeError("LangChain is not enabled or not installed")
 
-        if not settings.enable_postgres or not settings.enable_pgvector:
+        if not self._can_pgvector:
             raise RuntimeError("PostgreSQL with PGVector is required")
 
+        from langchain_community.vectorstores import PGVector
+
         connection_string = settings.database_url.replace(
             "postgresql+asyncpg://", "postgresql://"
         )
-
-        return PGVector(
+        vectorstore = self._vectorstores[collection_name] = PGVector(
             collection_name=collection_name,
             connection_string=connection_string,
             embedding_function=self._get_embeddings(),
         )
+        return vectorstore
 
     async def simple_completion(
         self,
@@ -125,6 +150,9 @@ class LangChainClient:
         if not self.enabled:
             raise RuntimeError("LangChain is not enabled or not installed")
 
+        from langchain.chains import LLMChain
+        from langchain.prompts import PromptTemplate
+
         llm = self._get_llm(model=model)
         prompt = PromptTemplate(
             template=template,
@@ -134,12 +162,27 @@ class LangChainClient:
         result = await chain.ainvoke(input_variables)
         return result["text"]
 
+    def _get_rag_chain(self, collection_name: str, model: str, k: int):
+        """Get or create a retrieval chain for a collection/model/k."""
+        key = (collection_name, model, k)
+        if key not in self._rag_chains:
+            from langchain.chains import ConversationalRetrievalChain
+
+            vectorstore = self.get_vectorstore(collection_name)
+            self._rag_chains[key] = ConversationalRetrievalChain.from_llm(
+                llm=self._get_llm(model=model),
+                retriever=vectorstore.as_retriever(search_kwargs={"k": k}),
+                return_source_documents=True,
+            )
+        return self._rag_chains[key]
+
     async def rag_query(
         self,
         query: str,
         collection_name: str = "documents",
         model: str = "gpt-3.5-turbo",
         k: int = 4,
+        conversation_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Retrieval Augmented Generation query.
@@ -149,6 +192,8 @@ class LangChainClient:
             collection_name: Vector collection to search
             model: LLM model identifier
             k: Number of documents to retrieve
+            conversation_id: Optional id whose earlier turns are used as
+                chat history; each call without one starts fresh
 
         Returns:
             Dict with answer and source documents
@@ -156,22 +201,20 @@ class LangChainClient:
         if not self.enabled:
             raise RuntimeError("LangChain is not enabled or not installed")
 
-        vectorstore = self.get_vectorstore(collection_name)
-        llm = self._get_llm(model=model)
+        qa_chain = self._get_rag_chain(collection_name, model, k)
 
-        memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True,
-        )
+        history: List[Tuple[str, str]] = []
+        if conversation_id is not None:
+            history = self._histories.setdefault(conversation_id, [])
+            self._histories.move_to_end(conversation_id)
+            if len(self._histories) > MAX_CONVERSATIONS:
+                self._histories.popitem(last=False)
 
-        qa_chain = ConversationalRetrievalChain.from_llm(
-            llm=llm,
-            retriever=vectorstore.as_retriever(search_kwargs={"k": k}),
-            memory=memory,
-            return_source_documents=True,
+        result = await qa_chain.ainvoke(
+            {"question": query, "chat_history": list(history)}
         )
-
-        result = await qa_chain.ainvoke({"question": query})
+        if conversation_id is not None:
+            history.append((query, result["answer"]))
 
         return {
             "answer": result["answer"],
@@ -205,7 +248,21 @@ class LangChainClient:
             raise RuntimeError("LangChain is not enabled or not installed")
 
         vectorstore = self.get_vectorstore(collection_name)
-        return await vectorstore.aadd_texts(texts=texts, metadatas=metadatas)
+        semaphore = asyncio.Semaphore(ADD_DOCUMENTS_CONCURRENCY)
+
+        # One embeddings request per batch, a bounded number in flight
+        async def add_batch(start: int) -> List[str]:
+            end = start + ADD_DOCUMENTS_BATCH_SIZE
+            async with semaphore:
+                return await vectorstore.aadd_texts(
+                    texts=texts[start:end],
+                    metadatas=metadatas[start:end] if metadatas else None,
+                )
+
+        batches = await asyncio.gather(
+            *(add_batch(start) for start in range(0, len(texts), ADD_DOCUMENTS_BATCH_SIZE))
+        )
+        return [doc_id for batch in batches for doc_id in batch]
 
     async def similarity_search(
         self,
@@ -14,16 +14,56 @@ Features:
 - Function calling
 """
 
-from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, TypedDict
 
-try:
-    import litellm
-    from litellm import acompletion, cost_per_token
-    LITELLM_AVAILABLE = True
-except ImportError:
-    LITELLM_AVAILABLE = False
+# The SDK itself is imported on first use
+LITELLM_AVAILABLE = find_spec("litellm") is not None
 
 from app.config.settings import settings
+from app.helpers.llm.batching import BatchScheduler
+from app.helpers.llm.response_cache import build_response_cache, cache_for_call
+from app.helpers.llm.streaming import coalesce_stream
+
+
+class LLMUsage(TypedDict):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cached_tokens: int
+
+
+class LLMResponse(TypedDict):
+    content: Optional[str]
+    model: str
+    usage: LLMUsage
+    cost: float
+    finish_reason: Optional[str]
+
+
+class LLMSummary(TypedDict):
+    usage: LLMUsage
+    cost: float
+
+
+@lru_cache(maxsize=512)
+def _price_of(model: str) -> Tuple[float, float]:
+    """Per-token (input, output) price for a model from LiteLLM's cost table."""
+    import litellm
+
+    prices = litellm.model_cost.get(model, {})
+    return (
+        prices.get("input_cost_per_token", 0.0),
+        prices.get("output_cost_per_token", 0.0),
+    )
+
+
+def _cached_tokens(usage: Any) -> int:
+    """Prompt tokens served from the provider's prompt cache, if reported."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details else 0
 
 
 class LiteLLMClient:
@@ -32,6 +72,8 @@ class LiteLLMClient:
     def __init__(self):
         self.enabled = settings.enable_llm_litellm and LITELLM_AVAILABLE
         if self.enabled:
+            import litellm
+
             # Configure API keys
             if settings.enable_llm_openai and settings.openai_api_key:
                 litellm.openai_key = settings.openai_api_key
@@ -42,22 +84,79 @@ class LiteLLMClient:
             if settings.enable_llm_ollama and settings.ollama_host:
                 litellm.ollama_host = settings.ollama_host
 
+        # Known models are resolved to their provider once, up front;
+        # anything else goes through litellm's per-call routing
+        self._router = None
+        self._router_models = frozenset(settings.litellm_router_models_list)
+        if self.enabled and self._router_models:
+            import litellm
+
+            self._router = litellm.Router(
+                model_list=[
+                    {"model_name": name, "litellm_params": {"model": name}}
+                    for name in self._router_models
+                ]
+            )
+        self._cache = build_response_cache("litellm", embed=self._embed_prompt)
+        self._batcher = (
+            BatchScheduler(
+                self._dispatch_batch,
+                window_ms=settings.llm_batch_window_ms,
+                max_batch=settings.llm_batch_max_size,
+            )
+            if settings.llm_batch_window_ms > 0
+            else None
+        )
+
+    def _acompletion(self, **payload: Any) -> Any:
+        """Dispatch through the router for pre-registered models."""
+        if self._router is not None and payload["model"] in self._router_models:
+            return self._router.acompletion(**payload)
+        from litellm import acompletion
+
+        return acompletion(**payload)
+
+    async def _dispatch_batch(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        """Send a window of completions to the providers concurrently."""
+        return await asyncio.gather(
+            *(self._acompletion(**payload) for payload in payloads),
+            return_exceptions=True,
+        )
+
+    async def close(self) -> None:
+        """Stop the request batcher."""
+        if self._batcher is not None:
+            await self._batcher.close()
+
+    async def _embed_prompt(self, text: str) -> List[float]:
+        """Embed a prompt for the semantic response cache."""
+        from litellm import aembedding
+
+        response = await aembedding(
+            model=settings.llm_semantic_cache_embedding_model,
+            input=[text],
+        )
+        return response.data[0]["embedding"]
+
     async def complete(
         self,
         messages: List[Dict[str, str]],
         model: str = "gpt-3.5-turbo",
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        cache: bool = True,
         **kwargs: Any,
-    ) -> Dict[str, Any]:
+    ) -> LLMResponse:
         """
         Generate a completion from the LLM.
 
         Args:
             messages: List of message dicts with 'role' and 'content'
             model: Model identifier (e.g., 'gpt-4', 'claude-3-opus')
-            temperature: Sampling temperature (0-2)
+            temperature: Sampling temperature (0-2); only temperature 0
+                responses are cached
             max_tokens: Maximum tokens to generate
+            cache: Set False to bypass the response cache for this call
             **kwargs: Additional model-specific parameters
 
         Returns:
@@ -66,27 +165,39 @@ class LiteLLMClient:
         if not self.enabled:
             raise RuntimeError("LiteLLM is not enabled or not installed")
 
-        response = await acompletion(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
             **kwargs,
-        )
+        }
+
+        response_cache = cache_for_call(self._cache, temperature, cache)
+        vector = None
+        if response_cache is not None:
+            cached, vector = await response_cache.get(payload)
+            if cached is not None:
+                return cached
+
+        if self._batcher is not None:
+            response = await self._batcher.submit(payload)
+        else:
+            response = await self._acompletion(**payload)
 
         # Extract relevant information
-        return {
+        result: LLMResponse = {
             "content": response.choices[0].message.content,
             "model": response.model,
-            "usage": {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            },
-            "cost": self._calculate_cost(response),
+            **self._summarize(response),
             "finish_reason": response.choices[0].finish_reason,
         }
 
+        if response_cache is not None:
+            await response_cache.set(payload, result, vector)
+
+        return result
+
     async def stream(
         self,
         messages: List[Dict[str, str]],
@@ -111,7 +222,7 @@ class LiteLLMClient:
         if not self.enabled:
             raise RuntimeError("LiteLLM is not enabled or not installed")
 
-        response = await acompletion(
+        response = await self._acompletion(
             model=model,
             messages=messages,
             temperature=temperature,
@@ -120,22 +231,36 @@ class LiteLLMClient:
             **kwargs,
         )
 
-        async for chunk in response:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        texts = (
+            chunk.choices[0].delta.content
+            async for chunk in response
+            if chunk.choices[0].delta.content
+        )
+        async for text in coalesce_stream(texts):
+            yield text
+
+    def _summarize(self, response: Any) -> LLMSummary:
+        """Usage and cost fields shared by every response shape."""
+        usage = response.usage
+        return {
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens,
+                "cached_tokens": _cached_tokens(usage),
+            },
+            "cost": self._calculate_cost(response),
+        }
 
     def _calculate_cost(self, response: Any) -> float:
         """Calculate the cost of the API call."""
         try:
-            prompt_cost = cost_per_token(
-                model=response.model,
-                prompt_tokens=response.usage.prompt_tokens,
-            )
-            completion_cost = cost_per_token(
-                model=response.model,
-                completion_tokens=response.usage.completion_tokens,
+            prompt_price, completion_price = _price_of(response.model)
+            usage = response.usage
+            return (
+                usage.prompt_tokens * prompt_price
+                + usage.completion_tokens * completion_price
             )
-            return prompt_cost + completion_cost
         except Exception:
             return 0.0
 
@@ -163,7 +288,7 @@ class LiteLLMClient:
         if not self.enabled:
             raise RuntimeError("LiteLLM is not enabled or not installed")
 
-        response = await acompletion(
+        response = await self._acompletion(
             model=model,
             messages=messages,
             functions=functions,
@@ -173,28 +298,20 @@ class LiteLLMClient:
 
         message = response.choices[0].message
 
+        summary = self._summarize(response)
+
         if message.function_call:
             return {
                 "type": "function_call",
                 "name": message.function_call.name,
                 "arguments": message.function_call.arguments,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens,
-                },
-                "cost": self._calculate_cost(response),
+                **summary,
             }
         else:
             return {
                 "type": "text",
                 "content": message.content,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens,
-                },
-                "cost": self._calculate_cost(response),
+                **summary,
             }
 
 
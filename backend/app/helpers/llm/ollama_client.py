@@ -10,13 +10,19 @@ Features:
 
 from typing import Any, AsyncIterator, Dict, List, Optional
 
+import orjson
+
 try:
     import aiohttp
+    from app.helpers.llm.http_session import get_shared_session
     AIOHTTP_AVAILABLE = True
 except ImportError:
     AIOHTTP_AVAILABLE = False
 
+STREAM_READ_SIZE = 4096
+
 from app.config.settings import settings
+from app.helpers.llm.streaming import coalesce_stream
 
 
 class OllamaClient:
@@ -38,13 +44,13 @@ class OllamaClient:
 
         url = f"{self.base_url}/api/{endpoint}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=data) as response:
-                if stream:
-                    return response
-                else:
-                    response.raise_for_status()
-                    return await response.json()
+        session = await get_shared_session()
+        async with session.post(url, json=data) as response:
+            if stream:
+                return response
+            else:
+                response.raise_for_status()
+                return await response.json()
 
     async def generate(
         self,
@@ -170,16 +176,32 @@ class OllamaClient:
 
         data.update(kwargs)
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/api/generate"
-            async with session.post(url, json=data) as response:
-                response.raise_for_status()
-                async for line in response.content:
+        async for text in coalesce_stream(self._stream_tokens(data)):
+            yield text
+
+    async def _stream_tokens(self, data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield the text of each NDJSON frame of a streaming generate call."""
+        session = await get_shared_session()
+        url = f"{self.base_url}/api/generate"
+        loads = orjson.loads
+        async with session.post(url, json=data) as response:
+            response.raise_for_status()
+            # Ollama streams newline-delimited JSON; read in blocks and
+            # parse only complete lines
+            buffer = bytearray()
+            async for block in response.content.iter_chunked(STREAM_READ_SIZE):
+                buffer += block
+                *lines, rest = buffer.split(b"\n")
+                buffer = bytearray(rest)
+                for line in lines:
                     if line:
-                        import json
-                        chunk = json.loads(line)
-                        if chunk.get("response"):
-                            yield chunk["response"]
+                        text = loads(line).get("response")
+                        if text:
+                            yield text
+            if buffer.strip():
+                text = loads(buffer).get("response")
+                if text:
+                    yield text
 
     async def list_models(self) -> List[Dict[str, Any]]:
         """
@@ -191,12 +213,12 @@ class OllamaClient:
         if not self.enabled:
             raise RuntimeError("Ollama is not enabled")
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/api/tags"
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return data.get("models", [])
+        session = await get_shared_session()
+        url = f"{self.base_url}/api/tags"
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return data.get("models", [])
 
     async def pull_model(self, model: str) -> bool:
         """
@@ -9,15 +9,116 @@ Use this for OpenAI-specific features not available through LiteLLM:
 - Speech-to-text (Whisper)
 """
 
-from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Literal, Optional
 
-try:
+import numpy as np
+import orjson
+import tiktoken
+
+# The SDK (and its httpx pool) is imported on first use, not at startup
+OPENAI_AVAILABLE = find_spec("openai") is not None
+
+if TYPE_CHECKING:
     from openai import AsyncOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = find_spec("h2") is not None
 
 from app.config.settings import settings
+from app.helpers.llm.embedding_cache import embedding_cache
+from app.helpers.llm.rate_limit import RateLimiter
+from app.helpers.llm.response_cache import build_response_cache, cache_for_call
+
+# 429s and transient errors are retried by the SDK with jittered backoff
+EMBEDDING_MAX_RETRIES = 5
+STREAM_RESPONSE_FLUSH_BYTES = 64
+# Stay under the per-request token limit of the embeddings endpoint
+EMBEDDING_BATCH_TOKEN_BUDGET = 250_000
+BATCH_JOB_TERMINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Context windows by model-name prefix; the longest matching prefix wins and
+# unknown models are not checked locally
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16_385,
+    "gpt-4": 8_192,
+    "gpt-4-32k": 32_768,
+    "gpt-4-turbo": 128_000,
+    "gpt-4-1106": 128_000,
+    "gpt-4-0125": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_047_576,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4-mini": 200_000,
+}
+
+
+@lru_cache(maxsize=8)
+def _encoding_for(model: str) -> "tiktoken.Encoding":
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _pack_batches(
+    texts: List[str], model: str, batch_size: int, max_batch_tokens: int
+) -> tuple[List[int], List[tuple[List[str], int]]]:
+    """
+    Sort texts by token length and pack them greedily into batches.
+
+    Returns:
+        (input indices in sorted order, [(batch texts, batch tokens), ...])
+    """
+    lengths = [
+        len(tokens) for tokens in _encoding_for(model).encode_ordinary_batch(texts)
+    ]
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+
+    batches: List[tuple[List[str], int]] = []
+    batch: List[str] = []
+    batch_tokens = 0
+    for idx in order:
+        if batch and (
+            len(batch) >= batch_size or batch_tokens + lengths[idx] > max_batch_tokens
+        ):
+            batches.append((batch, batch_tokens))
+            batch, batch_tokens = [], 0
+        batch.append(texts[idx])
+        batch_tokens += lengths[idx]
+    if batch:
+        batches.append((batch, batch_tokens))
+    return order, batches
+
+
+def _unsort(
+    order: List[int], results: List[List[List[float]]]
+) -> List[List[float]]:
+    """Scatter per-batch results from _pack_batches back to input order."""
+    embeddings: List[List[float]] = [[] for _ in order]
+    sorted_embeddings = (embedding for batch in results for embedding in batch)
+    for original_idx, embedding in zip(order, sorted_embeddings):
+        embeddings[original_idx] = embedding
+    return embeddings
+
+
+@lru_cache(maxsize=64)
+def _context_window(model: str) -> Optional[int]:
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)] if matches else None
+
+
+def _message_tokens(messages: List[Dict[str, Any]], model: str) -> int:
+    """Token count of the text content of messages."""
+    encoding = _encoding_for(model)
+    return sum(
+        len(encoding.encode_ordinary(message["content"]))
+        for message in messages
+        if isinstance(message.get("content"), str)
+    )
 
 
 class OpenAIClient:
@@ -25,26 +126,90 @@ class OpenAIClient:
 
     def __init__(self):
         self.enabled = settings.enable_llm_openai and OPENAI_AVAILABLE
+        self._key_ok = bool(settings.openai_api_key)
         self._client = None
+        # Organization quotas, shared by every method; 0 disables a limiter
+        self._rpm = RateLimiter(settings.openai_rpm) if settings.openai_rpm else None
+        self._tpm = RateLimiter(settings.openai_tpm) if settings.openai_tpm else None
+        self._cache = build_response_cache(
+            "openai",
+            embed=self.create_embedding,
+            similarity_threshold=settings.openai_semantic_cache_threshold,
+        )
 
     def _get_client(self) -> "AsyncOpenAI":
         """Get or create OpenAI client."""
+        if self._client is not None:
+            return self._client
+
         if not self.enabled:
             raise RuntimeError("OpenAI is not enabled or not installed")
 
-        if not settings.openai_api_key:
+        if not self._key_ok:
             raise RuntimeError("OpenAI API key is not configured")
 
-        if self._client is None:
-            self._client = AsyncOpenAI(api_key=settings.openai_api_key)
+        import httpx
+        from openai import AsyncOpenAI
+
+        # Retries are left to the SDK, which backs off on 429s
+        transport = httpx.AsyncHTTPTransport(retries=0, http2=HTTP2_AVAILABLE)
+        http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        )
+        # Nothing between the None check and this assignment awaits, so
+        # concurrent first calls on the event loop cannot build two pools
+        self._client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=http_client,
+        )
         return self._client
 
+    async def _throttle(self, count_tokens: Callable[[], int]) -> None:
+        """Wait for request and token quota; tokens are counted only if limited."""
+        if self._rpm is not None:
+            await self._rpm.acquire()
+        if self._tpm is not None:
+            await self._tpm.acquire(count_tokens())
+
+    def _preflight(
+        self, messages: List[Dict[str, Any]], model: str, max_tokens: Optional[int]
+    ) -> Optional[int]:
+        """
+        Reject requests the API would reject, without a round-trip.
+
+        Returns:
+            Prompt token count when it was computed (known context window),
+            else None
+
+        Raises:
+            ValueError: If messages is empty or the prompt plus max_tokens
+                exceeds the model's context window
+        """
+        if not messages:
+            raise ValueError("messages must not be empty")
+
+        limit = _context_window(model)
+        if limit is None:
+            return None
+        # Content tokens only, so the count is a lower bound and never
+        # rejects a request the API would accept
+        prompt_tokens = _message_tokens(messages, model)
+        if prompt_tokens + (max_tokens or 0) > limit:
+            raise ValueError(
+                f"Prompt ({prompt_tokens} tokens) plus max_tokens ({max_tokens or 0}) "
+                f"exceeds the {limit}-token context window of {model}"
+            )
+        return prompt_tokens
+
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         model: str = "gpt-3.5-turbo",
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        cache: bool = True,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -53,24 +218,42 @@ class OpenAIClient:
         Args:
             messages: List of message dicts with 'role' and 'content'
             model: Model identifier (gpt-4, gpt-3.5-turbo, etc.)
-            temperature: Sampling temperature (0-2)
+            temperature: Sampling temperature (0-2); only temperature 0
+                responses are cached
             max_tokens: Maximum tokens to generate
+            cache: Set False to bypass the response cache for this call
             **kwargs: Additional parameters
 
         Returns:
             Response dict with content and usage info
+
+        Raises:
+            ValueError: If messages is empty or too long for the model
         """
+        prompt_tokens = self._preflight(messages, model, max_tokens)
         client = self._get_client()
 
-        response = await client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
             **kwargs,
+        }
+
+        response_cache = cache_for_call(self._cache, temperature, cache)
+        vector = None
+        if response_cache is not None:
+            cached, vector = await response_cache.get(payload)
+            if cached is not None:
+                return cached
+
+        await self._throttle(
+            lambda: (prompt_tokens or _message_tokens(messages, model)) + (max_tokens or 0)
         )
+        response = await client.chat.completions.create(**payload)
 
-        return {
+        result = {
             "content": response.choices[0].message.content,
             "role": response.choices[0].message.role,
             "model": response.model,
@@ -82,6 +265,11 @@ class OpenAIClient:
             "finish_reason": response.choices[0].finish_reason,
         }
 
+        if response_cache is not None:
+            await response_cache.set(payload, result, vector)
+
+        return result
+
     async def stream_completion(
         self,
         messages: List[Dict[str, str]],
@@ -102,9 +290,16 @@ class OpenAIClient:
 
         Yields:
             Content chunks as they arrive
+
+        Raises:
+            ValueError: If messages is empty or too long for the model
         """
+        prompt_tokens = self._preflight(messages, model, max_tokens)
         client = self._get_client()
 
+        await self._throttle(
+            lambda: (prompt_tokens or _message_tokens(messages, model)) + (max_tokens or 0)
+        )
         stream = await client.chat.completions.create(
             model=model,
             messages=messages,
@@ -118,6 +313,51 @@ class OpenAIClient:
             if chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
 
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream chat completion as UTF-8 bytes for a StreamingResponse.
+
+        Usage:
+            return StreamingResponse(
+                openai_client.stream_response(messages), media_type="text/plain"
+            )
+
+        Being an async generator of bytes, Starlette iterates it on the
+        event loop without a threadpool and sends it without re-encoding.
+        Deltas are buffered until at least 64 bytes are pending.
+
+        Args:
+            messages: List of message dicts
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters
+
+        Yields:
+            Encoded content chunks
+        """
+        buffer = bytearray()
+        async for text in self.stream_completion(
+            messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        ):
+            buffer += text.encode("utf-8")
+            if len(buffer) >= STREAM_RESPONSE_FLUSH_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
     async def create_embedding(
         self,
         text: str,
@@ -133,38 +373,224 @@ class OpenAIClient:
         Returns:
             Embedding vector
         """
+        cached = (await embedding_cache.get_many(model, [text]))[0]
+        if cached is not None:
+            return cached
+
         client = self._get_client()
 
+        await self._throttle(lambda: len(_encoding_for(model).encode_ordinary(text)))
         response = await client.embeddings.create(
             model=model,
             input=text,
         )
 
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
+        await embedding_cache.set_many(model, [text], [embedding])
+        return embedding
 
     async def create_embeddings(
         self,
         texts: List[str],
         model: str = "text-embedding-3-small",
+        batch_size: int = 512,
+        max_concurrency: int = 8,
+        max_batch_tokens: int = EMBEDDING_BATCH_TOKEN_BUDGET,
     ) -> List[List[float]]:
         """
         Create embeddings for multiple texts.
 
+        Cached vectors are reused; the remaining distinct texts are sorted
+        by token length and packed greedily into batches of at most
+        batch_size texts and max_batch_tokens tokens, so one long text
+        doesn't force many short ones into an extra request.
+
         Args:
             texts: List of texts to embed
             model: Embedding model
+            batch_size: Maximum texts per API request
+            max_concurrency: Maximum requests in flight
+            max_batch_tokens: Maximum tokens per API request
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in input order
         """
-        client = self._get_client()
+        embeddings = await embedding_cache.get_many(model, texts)
+        misses = list(
+            dict.fromkeys(texts[idx] for idx, vector in enumerate(embeddings) if vector is None)
+        )
+        if not misses:
+            return embeddings
 
-        response = await client.embeddings.create(
-            model=model,
-            input=texts,
+        fresh = await self._embed_uncached(
+            misses, model, batch_size, max_concurrency, max_batch_tokens
         )
+        await embedding_cache.set_many(model, misses, fresh)
+
+        by_text = dict(zip(misses, fresh))
+        return [
+            vector if vector is not None else by_text[text]
+            for text, vector in zip(texts, embeddings)
+        ]
+
+    async def create_embeddings_np(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-3-small",
+        dtype: Literal["float32", "float16", "int8"] = "float32",
+        normalize: bool = True,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """
+        Create embeddings as a packed (len(texts), dims) array.
+
+        A compact alternative to create_embeddings for similarity search:
+        float16 halves and int8 quarters the size of float32, and all of
+        them are far smaller than lists of Python floats.
+
+        Args:
+            texts: List of texts to embed
+            model: Embedding model
+            dtype: Output dtype; int8 stores round(x * 127) of the
+                L2-normalized vector, so it always normalizes
+            normalize: L2-normalize rows so dot product == cosine similarity
+            **kwargs: Batching options passed to create_embeddings
+
+        Returns:
+            Embedding matrix, one row per input text
+        """
+        embeddings = await self.create_embeddings(texts, model, **kwargs)
+        arr = np.asarray(embeddings, dtype=np.float32)
+        if arr.size == 0:
+            return arr.astype(dtype)
+
+        if normalize or dtype == "int8":
+            norms = np.linalg.norm(arr, axis=1, keepdims=True)
+            np.divide(arr, norms, out=arr, where=norms > 0)
+
+        if dtype == "int8":
+            return np.rint(arr * 127).astype(np.int8)
+        return arr.astype(dtype, copy=False)
+
+    async def _embed_uncached(
+        self,
+        texts: List[str],
+        model: str,
+        batch_size: int,
+        max_concurrency: int,
+        max_batch_tokens: int,
+    ) -> List[List[float]]:
+        """Embed texts in length-sorted, token-budgeted concurrent batches."""
+        client = self._get_client().with_options(max_retries=EMBEDDING_MAX_RETRIES)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def embed_batch(batch: List[str], tokens: int) -> List[List[float]]:
+            async with semaphore:
+                await self._throttle(lambda: tokens)
+                response = await client.embeddings.create(model=model, input=batch)
+            return [item.embedding for item in response.data]
+
+        order, batches = _pack_batches(texts, model, batch_size, max_batch_tokens)
+        results = await asyncio.gather(
+            *(embed_batch(batch, tokens) for batch, tokens in batches)
+        )
+        return _unsort(order, results)
+
+    async def create_embeddings_batch_async(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-3-small",
+        poll_interval: float = 60.0,
+        batch_size: int = 512,
+        max_batch_tokens: int = EMBEDDING_BATCH_TOKEN_BUDGET,
+    ) -> List[List[float]]:
+        """
+        Create embeddings through the Batch API, for offline backfills.
+
+        Batch jobs cost half as much and have separate, higher limits, but
+        may take up to 24h, so this is only for non-interactive work such as
+        re-indexing. Cached vectors are reused; the rest are packed as in
+        create_embeddings, one batch request per packed group. Vectors from
+        successful requests are cached even if others fail, so a retry only
+        resubmits the failures.
+
+        Args:
+            texts: List of texts to embed
+            model: Embedding model
+            poll_interval: Seconds between job status checks
+            batch_size: Maximum texts per request in the job
+            max_batch_tokens: Maximum tokens per request in the job
+
+        Returns:
+            List of embedding vectors, in input order
+
+        Raises:
+            RuntimeError: If the job does not complete or any request fails
+        """
+        embeddings = await embedding_cache.get_many(model, texts)
+        misses = list(
+            dict.fromkeys(texts[idx] for idx, vector in enumerate(embeddings) if vector is None)
+        )
+        if not misses:
+            return embeddings
+
+        client = self._get_client()
+        _, batches = _pack_batches(misses, model, batch_size, max_batch_tokens)
+        lines = b"\n".join(
+            orjson.dumps(
+                {
+                    "custom_id": str(idx),
+                    "method": "POST",
+                    "url": "/v1/embeddings",
+                    "body": {"model": model, "input": batch},
+                }
+            )
+            for idx, (batch, _) in enumerate(batches)
+        )
+        input_file = await client.files.create(
+            file=("embeddings.jsonl", lines), purpose="batch"
+        )
+        job = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/embeddings",
+            completion_window="24h",
+        )
+        while job.status not in BATCH_JOB_TERMINAL_STATES:
+            await asyncio.sleep(poll_interval)
+            job = await client.batches.retrieve(job.id)
+
+        if job.status != "completed" or not job.output_file_id:
+            raise RuntimeError(f"Embedding batch {job.id} ended with status {job.status}")
+
+        output = await client.files.content(job.output_file_id)
+        results: List[Optional[List[List[float]]]] = [None] * len(batches)
+        for line in output.content.splitlines():
+            if not line:
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                data = sorted(response["body"]["data"], key=lambda item: item["index"])
+                results[int(record["custom_id"])] = [item["embedding"] for item in data]
+
+        by_text = {
+            text: vector
+            for (batch, _), result in zip(batches, results)
+            if result is not None
+            for text, vector in zip(batch, result)
+        }
+        await embedding_cache.set_many(model, list(by_text), list(by_text.values()))
+
+        failed = sum(result is None for result in results)
+        if failed:
+            raise RuntimeError(
+                f"Embedding batch {job.id}: {failed} of {len(batches)} requests failed"
+            )
 
-        return [item.embedding for item in response.data]
+        return [
+            vector if vector is not None else by_text[text]
+            for text, vector in zip(texts, embeddings)
+        ]
 
     async def generate_image(
         self,
@@ -189,6 +615,7 @@ class OpenAIClient:
         """
         client = self._get_client()
 
+        await self._throttle(lambda: 0)
         response = await client.images.generate(
             model=model,
             prompt=prompt,
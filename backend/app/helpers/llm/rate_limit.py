@@ -0,0 +1,58 @@
+"""
+Leaky-bucket rate limiting for provider quotas.
+
+Providers enforce requests-per-minute and tokens-per-minute budgets; pacing
+calls locally keeps throughput at the quota instead of bouncing off 429s
+and backing off below it.
+"""
+
+import asyncio
+
+
+class RateLimiter:
+    """
+    Allow at most max_rate units per time_period, smoothed over the period.
+
+    Waiters are served in arrival order. A single acquire larger than
+    max_rate is clamped to max_rate so it waits for an empty bucket rather
+    than forever.
+
+    Args:
+        max_rate: Units (requests or tokens) allowed per period
+        time_period: Period length in seconds
+
+    Usage:
+        rpm = RateLimiter(3500)
+        async with rpm:
+            ...
+        await tpm.acquire(prompt_tokens)
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self._leak_rate = max_rate / time_period
+        self._level = 0.0
+        self._last = 0.0
+        self._lock = asyncio.Lock()
+
+    def _leak(self, now: float) -> None:
+        self._level = max(0.0, self._level - (now - self._last) * self._leak_rate)
+        self._last = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until amount units fit in the bucket, then take them."""
+        amount = min(amount, self.max_rate)
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            self._leak(loop.time())
+            overflow = self._level + amount - self.max_rate
+            if overflow > 0:
+                await asyncio.sleep(overflow / self._leak_rate)
+                self._leak(loop.time())
+            self._level += amount
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
@@ -0,0 +1,248 @@
+"""
+Response cache for LLM completions.
+
+Only deterministic (temperature 0) calls are cached: at any other
+temperature callers expect a fresh sample on every call.
+
+Two tiers:
+- Exact: Redis entry keyed by a hash of the full request payload
+- Semantic (optional): in-process embedding index; a new prompt whose
+  embedding is within the cosine threshold of a cached prompt with the
+  same model, parameters and history reuses that response
+
+Also provides a small LRU for provider token counts.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+import orjson
+
+from app.config.settings import settings
+from app.core.logging import get_logger
+from app.helpers.redis_helper import redis_helper
+
+logger = get_logger(__name__)
+
+EmbedFn = Callable[[str], Awaitable[List[float]]]
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _tokens_saved(value: Dict[str, Any]) -> int:
+    usage = value.get("usage") or {}
+    if "total_tokens" in usage:
+        return usage["total_tokens"] or 0
+    return (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
+
+
+class ResponseCache:
+    """
+    Exact + semantic cache for non-streaming completions.
+
+    Args:
+        namespace: Redis key prefix, one per client
+        ttl_seconds: Lifetime of cached responses in both tiers
+        embed: Async function returning an embedding for a prompt; the
+            semantic tier is disabled when omitted
+        similarity_threshold: Minimum cosine similarity for a semantic hit
+        max_semantic_entries: Ring buffer size of the semantic tier
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int = 3600,
+        embed: Optional[EmbedFn] = None,
+        similarity_threshold: float = 0.9,
+        max_semantic_entries: int = 10_000,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * max_semantic_entries
+        self._next_slot = 0
+        self._filled = 0
+
+    def _exact_key(self, payload: Dict[str, Any]) -> str:
+        return f"llm_cache:{self.namespace}:{_digest(payload)}"
+
+    @staticmethod
+    def _semantic_scope(payload: Dict[str, Any]) -> tuple[str, str]:
+        """Split a payload into (scope hash, last user prompt)."""
+        messages = payload.get("messages") or []
+        if not messages or not isinstance(messages[-1].get("content"), str):
+            return "", ""
+        prompt = messages[-1]["content"]
+        scoped = {**payload, "messages": [*messages[:-1], {**messages[-1], "content": ""}]}
+        return _digest(scoped), prompt
+
+    async def _embed_prompt(self, prompt: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(await self.embed(prompt), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    async def get(
+        self, payload: Dict[str, Any]
+    ) -> tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            (cached response or None, prompt embedding to pass to set())
+        """
+        try:
+            cached = await redis_helper.get(self._exact_key(payload))
+        except Exception as e:
+            logger.debug(f"Exact LLM cache unavailable: {e}")
+            cached = None
+        if isinstance(cached, dict):
+            logger.info(
+                f"[LLM_CACHE] Exact hit ({self.namespace}, "
+                f"tokens saved={_tokens_saved(cached)})"
+            )
+            return cached, None
+
+        if self.embed is None:
+            return None, None
+
+        scope, prompt = self._semantic_scope(payload)
+        if not prompt:
+            return None, None
+        vector = await self._embed_prompt(prompt)
+        if vector is None or self._vectors is None or self._filled == 0:
+            return None, vector
+        if vector.shape[0] != self._vectors.shape[1]:
+            return None, None
+
+        scores = self._vectors[: self._filled] @ vector
+        now = time.monotonic()
+        candidates = np.flatnonzero(scores >= self.similarity_threshold)
+        for slot in candidates[np.argsort(scores[candidates])[::-1]]:
+            entry = self._entries[int(slot)]
+            if entry and entry["scope"] == scope and entry["expires_at"] >= now:
+                logger.info(
+                    f"[LLM_CACHE] Semantic hit ({self.namespace}, "
+                    f"similarity={scores[slot]:.4f}, "
+                    f"tokens saved={_tokens_saved(entry['value'])})"
+                )
+                return entry["value"], vector
+        return None, vector
+
+    async def set(
+        self,
+        payload: Dict[str, Any],
+        value: Dict[str, Any],
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        """Store a response in both tiers."""
+        try:
+            await redis_helper.set(self._exact_key(payload), value, self.ttl_seconds)
+        except Exception as e:
+            logger.debug(f"Exact LLM cache unavailable: {e}")
+
+        if vector is None:
+            return
+        scope, _ = self._semantic_scope(payload)
+        if self._vectors is None:
+            self._vectors = np.zeros(
+                (self.max_semantic_entries, vector.shape[0]), dtype=np.float32
+            )
+        elif vector.shape[0] != self._vectors.shape[1]:
+            return
+
+        slot = self._next_slot
+        self._vectors[slot] = vector
+        self._entries[slot] = {
+            "scope": scope,
+            "value": value,
+            "expires_at": time.monotonic() + self.ttl_seconds,
+        }
+        self._next_slot = (slot + 1) % self.max_semantic_entries
+        self._filled = max(self._filled, slot + 1)
+
+
+class TokenCountCache:
+    """
+    LRU of provider token counts keyed by (model, content hash).
+
+    Args:
+        max_entries: Number of counts to keep
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[tuple[str, bytes], int]" = OrderedDict()
+
+    async def get_or_count(
+        self, model: str, text: str, count: Callable[[], Awaitable[int]]
+    ) -> int:
+        """Return the cached count for text, calling count() on a miss."""
+        key = (model, hashlib.blake2b(text.encode(), digest_size=16).digest())
+        cached = self._counts.get(key)
+        if cached is not None:
+            self._counts.move_to_end(key)
+            return cached
+
+        tokens = await count()
+        self._counts[key] = tokens
+        if len(self._counts) > self.max_entries:
+            self._counts.popitem(last=False)
+        return tokens
+
+
+def cache_for_call(
+    cache: Optional[ResponseCache], temperature: Optional[float], enabled: bool = True
+) -> Optional[ResponseCache]:
+    """
+    Return the cache to use for one call, or None to bypass it.
+
+    Args:
+        cache: The client's cache (None when disabled in settings)
+        temperature: Sampling temperature of the call; None means the
+            provider default, which is not deterministic
+        enabled: Per-call opt-out
+    """
+    if not enabled or cache is None or temperature != 0:
+        return None
+    return cache
+
+
+def build_response_cache(
+    namespace: str,
+    embed: Optional[EmbedFn] = None,
+    similarity_threshold: Optional[float] = None,
+) -> Optional[ResponseCache]:
+    """
+    Create a response cache from settings, or None when disabled.
+
+    Args:
+        namespace: Redis key prefix, one per client
+        embed: Prompt embedding function for the semantic tier (optional)
+        similarity_threshold: Client-specific semantic threshold; defaults
+            to LLM_SEMANTIC_CACHE_THRESHOLD
+    """
+    if not settings.llm_response_cache_enabled:
+        return None
+    if similarity_threshold is None:
+        similarity_threshold = settings.llm_semantic_cache_threshold
+    return ResponseCache(
+        namespace=namespace,
+        ttl_seconds=settings.llm_response_cache_ttl,
+        embed=embed if settings.llm_semantic_cache_enabled else None,
+        similarity_threshold=similarity_threshold,
+        max_semantic_entries=settings.llm_semantic_cache_size,
+    )
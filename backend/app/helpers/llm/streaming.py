@@ -0,0 +1,80 @@
+"""
+Streaming helpers shared by the LLM clients.
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+STREAM_FLUSH_INTERVAL = 0.025  # seconds
+STREAM_FLUSH_CHARS = 256
+
+
+async def coalesce_stream(
+    source: AsyncIterator[str],
+    max_interval: float = STREAM_FLUSH_INTERVAL,
+    max_chars: int = STREAM_FLUSH_CHARS,
+) -> AsyncIterator[str]:
+    """
+    Merge token-sized chunks into larger ones.
+
+    The first chunk is yielded immediately so time-to-first-token is
+    unchanged; after that, chunks are buffered until max_interval has passed
+    since the first buffered chunk or max_chars have accumulated.
+
+    Args:
+        source: Async iterator of text chunks
+        max_interval: Longest time a chunk may wait in the buffer
+        max_chars: Buffer size that triggers an immediate flush
+
+    Yields:
+        Concatenated text chunks
+    """
+    loop = asyncio.get_running_loop()
+    iterator = source.__aiter__()
+    buffer: list[str] = []
+    size = 0
+    deadline = 0.0
+    first = True
+    # The pending __anext__ is kept across flushes rather than cancelled on
+    # timeout, since cancelling it would close the source generator
+    pending: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            timeout = max(0.0, deadline - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+                continue
+
+            try:
+                text = pending.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                pending = None
+
+            if first:
+                first = False
+                yield text
+                continue
+
+            if not buffer:
+                deadline = loop.time() + max_interval
+            buffer.append(text)
+            size += len(text)
+            if size >= max_chars:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -10,9 +10,11 @@ Provides:
 - GridFS for file storage
 """
 
-from typing import Any
+from typing import Any, AsyncIterator
 
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
 
 from app.config.settings import settings
 from app.core.logging import get_logger
@@ -51,7 +53,11 @@ class MongoDBHelper:
             self._client = AsyncIOMotorClient(
                 settings.mongodb_url,
                 serverSelectionTimeoutMS=5000,
-                maxPoolSize=10,
+                maxPoolSize=settings.mongodb_max_pool_size,
+                minPoolSize=settings.mongodb_min_pool_size,
+                maxIdleTimeMS=300_000,
+                waitQueueTimeoutMS=10_000,
+                retryWrites=True,
             )
 
             # Get database
@@ -140,20 +146,66 @@ class MongoDBHelper:
         result = await coll.insert_one(document)
         return str(result.inserted_id)
 
-    async def insert_many(self, collection: str, documents: list[dict]) -> list[str]:
+    async def insert_many(
+        self, collection: str, documents: list[dict], return_raw_ids: bool = False
+    ) -> list[str] | list[ObjectId]:
         """
         Insert multiple documents.
 
+        The insert is unordered: the server may apply documents in parallel
+        and a failed document doesn't stop the rest.
+
         Args:
             collection: Collection name
             documents: List of documents to insert
+            return_raw_ids: Return the driver's ObjectIds instead of strings,
+                for bulk loads that never serialize them
+
+        Returns:
+            List of inserted document IDs (failed documents are skipped)
+        """
+        coll = self.get_collection(collection)
+        try:
+            result = await coll.insert_many(documents, ordered=False)
+            if return_raw_ids:
+                return result.inserted_ids
+            return list(map(str, result.inserted_ids))
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            logger.warning(
+                f"insert_many into {collection}: {len(failed)} of "
+                f"{len(documents)} documents failed"
+            )
+            # The driver assigns _id client-side before sending
+            ids = [
+                document["_id"]
+                for idx, document in enumerate(documents)
+                if idx not in failed
+            ]
+            return ids if return_raw_ids else list(map(str, ids))
+
+    async def bulk_write(
+        self, collection: str, operations: list, ordered: bool = False
+    ) -> dict[str, int]:
+        """
+        Execute mixed write operations in one round-trip.
+
+        Args:
+            collection: Collection name
+            operations: pymongo InsertOne/UpdateOne/UpdateMany/DeleteOne/... ops
+            ordered: Stop at the first error and apply in order (default False)
 
         Returns:
-            List of inserted document IDs
+            Dict with inserted, modified, deleted and upserted counts
         """
         coll = self.get_collection(collection)
-        result = await coll.insert_many(documents)
-        return [str(id_) for id_ in result.inserted_ids]
+        result = await coll.bulk_write(operations, ordered=ordered)
+        return {
+            "inserted": result.inserted_count,
+            "modified": result.modified_count,
+            "deleted": result.deleted_count,
+            "upserted": result.upserted_count,
+        }
 
     async def find_one(
         self, collection: str, filter_: dict, projection: dict | None = None
@@ -180,10 +232,14 @@ class MongoDBHelper:
         limit: int | None = None,
         skip: int = 0,
         sort: list[tuple[str, int]] | None = None,
+        hint: str | list[tuple[str, int]] | None = None,
     ) -> list[dict]:
         """
         Find multiple documents.
 
+        Pass a projection when only some fields are needed; every extra
+        field costs network transfer and BSON decoding.
+
         Args:
             collection: Collection name
             filter_: Query filter (optional, returns all if None)
@@ -191,12 +247,18 @@ class MongoDBHelper:
             limit: Maximum number of documents (optional)
             skip: Number of documents to skip (default 0)
             sort: Sort order as list of (field, direction) tuples (optional)
+            hint: Index name or key pattern to force (optional)
 
         Returns:
             List of documents
         """
         coll = self.get_collection(collection)
-        cursor = coll.find(filter_ or {}, projection)
+        cursor = coll.find(
+            filter_ or {}, projection, batch_size=min(limit or 1000, 1000)
+        )
+
+        if hint:
+            cursor = cursor.hint(hint)
 
         if skip:
             cursor = cursor.skip(skip)
@@ -275,7 +337,7 @@ class MongoDBHelper:
         return result.deleted_count
 
     async def aggregate(
-        self, collection: str, pipeline: list[dict]
+        self, collection: str, pipeline: list[dict], batch_size: int = 1000
     ) -> list[dict]:
         """
         Execute aggregation pipeline.
@@ -283,13 +345,36 @@ class MongoDBHelper:
         Args:
             collection: Collection name
             pipeline: Aggregation pipeline stages
+            batch_size: Documents per server round-trip (default 1000)
 
         Returns:
             List of aggregation results
         """
+        return [
+            doc async for doc in self.aggregate_stream(collection, pipeline, batch_size)
+        ]
+
+    async def aggregate_stream(
+        self, collection: str, pipeline: list[dict], batch_size: int = 1000
+    ) -> AsyncIterator[dict]:
+        """
+        Execute aggregation pipeline and yield results as batches arrive.
+
+        Only one batch is held in memory at a time, and large $sort/$group
+        stages may spill to disk on the server instead of failing.
+
+        Args:
+            collection: Collection name
+            pipeline: Aggregation pipeline stages
+            batch_size: Documents per server round-trip (default 1000)
+
+        Yields:
+            Aggregation results
+        """
         coll = self.get_collection(collection)
-        cursor = coll.aggregate(pipeline)
-        return await cursor.to_list(length=None)
+        cursor = coll.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size)
+        async for doc in cursor:
+            yield doc
 
     async def count_documents(
         self, collection: str, filter_: dict | None = None
@@ -297,6 +382,9 @@ class MongoDBHelper:
         """
         Count documents matching filter.
 
+        Without a filter the count comes from collection metadata instead
+        of a scan.
+
         Args:
             collection: Collection name
             filter_: Query filter (optional, counts all if None)
@@ -305,7 +393,9 @@ class MongoDBHelper:
             Number of matching documents
         """
         coll = self.get_collection(collection)
-        return await coll.count_documents(filter_ or {})
+        if not filter_:
+            return await coll.estimated_document_count()
+        return await coll.count_documents(filter_)
 
 
 # Global singleton instance
@@ -9,15 +9,189 @@ Provides:
 - Batch operations
 """
 
-from typing import Any
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncIterator
 
-from neo4j import AsyncGraphDatabase, AsyncDriver
+from neo4j import AsyncDriver, AsyncGraphDatabase, AsyncSession
 
 from app.config.settings import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Rows per UNWIND transaction, and how many such transactions run at once
+BATCH_WRITE_SIZE = 10_000
+BATCH_WRITE_CONCURRENCY = 4
+
+# Session shared by helper calls inside session_scope()
+_scoped_session: ContextVar[AsyncSession | None] = ContextVar(
+    "neo4j_scoped_session", default=None
+)
+
+# Labels, relationship types and property keys are interpolated into Cypher,
+# so they must be plain identifiers
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _identifier(name: str) -> str:
+    if not IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid Cypher identifier: {name!r}")
+    return name
+
+
+def _key_signature(properties: dict | None) -> tuple[str, ...]:
+    """Sorted, validated property keys; the cache key for query text."""
+    return tuple(sorted(_identifier(key) for key in (properties or {})))
+
+
+def _match_conditions(var: str, prefix: str, keys: tuple[str, ...]) -> list[str]:
+    return [f"{var}.{key} = ${prefix}{key}" for key in keys]
+
+
+@lru_cache(maxsize=1024)
+def _param_names(prefix: str, keys: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(f"{prefix}{key}" for key in keys)
+
+
+def _prefixed_params(prefix: str, keys: tuple[str, ...], properties: dict) -> dict:
+    """Parameter dict for properties whose keys are already in keys."""
+    return dict(zip(_param_names(prefix, keys), map(properties.__getitem__, keys)))
+
+
+# Query text depends only on labels/types and property key sets, so each
+# distinct shape is built once and the server's plan cache sees stable text;
+# values (and LIMIT) are always parameters
+
+
+@lru_cache(maxsize=1024)
+def _create_node_query(label: str, keys: tuple[str, ...]) -> str:
+    props = ", ".join(f"{key}: ${key}" for key in keys)
+    return f"CREATE (n:{_identifier(label)} {{{props}}}) RETURN n"
+
+
+@lru_cache(maxsize=1024)
+def _find_nodes_query(label: str, keys: tuple[str, ...], limited: bool) -> str:
+    query = f"MATCH (n:{_identifier(label)})"
+    if keys:
+        query += " WHERE " + " AND ".join(_match_conditions("n", "", keys))
+    query += " RETURN n"
+    if limited:
+        query += " LIMIT $__limit"
+    return query
+
+
+@lru_cache(maxsize=1024)
+def _create_relationship_query(
+    from_label: str,
+    from_keys: tuple[str, ...],
+    to_label: str,
+    to_keys: tuple[str, ...],
+    relationship_type: str,
+    rel_keys: tuple[str, ...],
+) -> str:
+    conditions = _match_conditions("a", "from_", from_keys) + _match_conditions(
+        "b", "to_", to_keys
+    )
+    if rel_keys:
+        rel_props = ", ".join(f"{key}: $rel_{key}" for key in rel_keys)
+        rel_create = f"-[r:{_identifier(relationship_type)} {{{rel_props}}}]->"
+    else:
+        rel_create = f"-[r:{_identifier(relationship_type)}]->"
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+            MATCH (a:{_identifier(from_label)}), (b:{_identifier(to_label)})
+            {where}
+            CREATE (a){rel_create}(b)
+            RETURN r
+        """
+
+
+@lru_cache(maxsize=1024)
+def _shortest_path_query(
+    from_label: str,
+    from_keys: tuple[str, ...],
+    to_label: str,
+    to_keys: tuple[str, ...],
+    relationship_type: str | None,
+    max_depth: int,
+) -> str:
+    conditions = _match_conditions("a", "from_", from_keys) + _match_conditions(
+        "b", "to_", to_keys
+    )
+    # Variable-length bounds cannot be parameters in Cypher
+    if relationship_type:
+        rel = f"[:{_identifier(relationship_type)}*1..{int(max_depth)}]"
+    else:
+        rel = f"[*1..{int(max_depth)}]"
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+            MATCH (a:{_identifier(from_label)}), (b:{_identifier(to_label)}),
+                  p = shortestPath((a){rel}(b))
+            {where}
+            RETURN p
+        """
+
+
+@lru_cache(maxsize=1024)
+def _gds_shortest_path_query(
+    from_label: str,
+    from_keys: tuple[str, ...],
+    to_label: str,
+    to_keys: tuple[str, ...],
+    weighted: bool,
+) -> str:
+    conditions = _match_conditions("a", "from_", from_keys) + _match_conditions(
+        "b", "to_", to_keys
+    )
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    weight = ", relationshipWeightProperty: $__weight" if weighted else ""
+    return f"""
+            MATCH (a:{_identifier(from_label)}), (b:{_identifier(to_label)})
+            {where}
+            CALL gds.shortestPath.dijkstra.stream(
+                $__graph, {{sourceNode: a, targetNode: b{weight}}}
+            )
+            YIELD path
+            RETURN path AS p
+        """
+
+
+@lru_cache(maxsize=1024)
+def _create_nodes_query(label: str) -> str:
+    return (
+        f"UNWIND $rows AS row CREATE (n:{_identifier(label)}) SET n = row "
+        "RETURN count(n) AS count"
+    )
+
+
+@lru_cache(maxsize=1024)
+def _create_relationships_query(
+    from_label: str, to_label: str, relationship_type: str, match_key: str
+) -> str:
+    key = _identifier(match_key)
+    return f"""
+            UNWIND $pairs AS p
+            MATCH (a:{_identifier(from_label)} {{{key}: p.from_id}}),
+                  (b:{_identifier(to_label)} {{{key}: p.to_id}})
+            CREATE (a)-[r:{_identifier(relationship_type)}]->(b)
+            SET r = coalesce(p.props, {{}})
+            RETURN count(r) AS count
+        """
+
+
+@lru_cache(maxsize=1024)
+def _delete_node_query(label: str, keys: tuple[str, ...], detach: bool) -> str:
+    props = " AND ".join(_match_conditions("n", "", keys))
+    delete_clause = "DETACH DELETE" if detach else "DELETE"
+    return (
+        f"MATCH (n:{_identifier(label)}) WHERE {props} "
+        f"{delete_clause} n RETURN count(n) as deleted"
+    )
+
 
 class Neo4jHelper:
     """
@@ -72,6 +246,43 @@ class Neo4jHelper:
             raise RuntimeError("Neo4j driver not initialized")
         return self._driver.session()
 
+    @asynccontextmanager
+    async def session_scope(
+        self, database: str | None = None
+    ) -> AsyncIterator[AsyncSession]:
+        """
+        Share one session across helper calls in this context.
+
+        execute_query/execute_write (and the helpers built on them) reuse
+        the scoped session instead of opening one per call. Nested scopes
+        reuse the outer session.
+
+        Usage:
+            async with neo4j_helper.session_scope() as session:
+                await neo4j_helper.find_nodes("Person")
+                await neo4j_helper.create_node("Person", {"name": "Bob"})
+        """
+        current = _scoped_session.get()
+        if current is not None:
+            yield current
+            return
+
+        async with self.get_driver().session(database=database) as session:
+            token = _scoped_session.set(session)
+            try:
+                yield session
+            finally:
+                _scoped_session.reset(token)
+
+    @asynccontextmanager
+    async def _session(self, database: str | None) -> AsyncIterator[AsyncSession]:
+        scoped = _scoped_session.get()
+        if scoped is not None:
+            yield scoped
+            return
+        async with self.get_driver().session(database=database) as session:
+            yield session
+
     async def close(self):
         """
         Close Neo4j driver.
@@ -126,13 +337,43 @@ class Neo4jHelper:
                 {"name": "Alice"}
             )
         """
-        driver = self.get_driver()
-
-        async with driver.session(database=database) as session:
+        async with self._session(database) as session:
             result = await session.run(query, parameters or {})
             records = await result.data()
             return records
 
+    async def stream_query(
+        self,
+        query: str,
+        parameters: dict | None = None,
+        database: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Execute Cypher query and yield records as they arrive.
+
+        Records are pulled from the server in fetch-size batches, so large
+        result sets are never held in memory at once and the consumer can
+        stop early.
+
+        Args:
+            query: Cypher query string
+            parameters: Query parameters (optional)
+            database: Database name (optional, uses default if None)
+
+        Yields:
+            Result records as dictionaries
+
+        Usage:
+            async for record in neo4j_helper.stream_query(
+                "MATCH (n:Person) RETURN n"
+            ):
+                process(record)
+        """
+        async with self._session(database) as session:
+            result = await session.run(query, parameters or {})
+            async for record in result:
+                yield record.data()
+
     async def execute_write(
         self,
         query: str,
@@ -156,13 +397,11 @@ class Neo4jHelper:
                 {"name": "Bob"}
             )
         """
-        driver = self.get_driver()
-
         async def _write_tx(tx):
             result = await tx.run(query, parameters or {})
             return await result.data()
 
-        async with driver.session(database=database) as session:
+        async with self._session(database) as session:
             data = await session.execute_write(_write_tx)
             return {"data": data}
 
@@ -189,13 +428,92 @@ class Neo4jHelper:
                 {"name": "Alice", "age": 30}
             )
         """
-        # Build property string for Cypher
-        props = ", ".join(f"{k}: ${k}" for k in properties.keys())
-        query = f"CREATE (n:{label} {{{props}}}) RETURN n"
+        query = _create_node_query(label, _key_signature(properties))
 
         result = await self.execute_write(query, properties, database)
         return result["data"][0] if result["data"] else {}
 
+    async def _write_batches(
+        self, query: str, key: str, rows: list, database: str | None
+    ) -> int:
+        """Run an UNWIND write over rows in bounded concurrent chunks."""
+        # A session is not safe for concurrent use, so a scoped one writes
+        # its chunks one at a time
+        concurrency = 1 if _scoped_session.get() is not None else BATCH_WRITE_CONCURRENCY
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def write_chunk(start: int) -> int:
+            async with semaphore:
+                result = await self.execute_write(
+                    query, {key: rows[start : start + BATCH_WRITE_SIZE]}, database
+                )
+            return result["data"][0]["count"] if result["data"] else 0
+
+        counts = await asyncio.gather(
+            *(write_chunk(start) for start in range(0, len(rows), BATCH_WRITE_SIZE))
+        )
+        return sum(counts)
+
+    async def create_nodes(
+        self,
+        label: str,
+        rows: list[dict],
+        database: str | None = None,
+    ) -> int:
+        """
+        Create many nodes with one query per batch.
+
+        Args:
+            label: Node label
+            rows: Property dicts, one per node
+            database: Database name (optional)
+
+        Returns:
+            Number of nodes created
+
+        Usage:
+            created = await neo4j_helper.create_nodes(
+                "Person",
+                [{"name": "Alice"}, {"name": "Bob"}]
+            )
+        """
+        query = _create_nodes_query(label)
+        return await self._write_batches(query, "rows", rows, database)
+
+    async def create_relationships(
+        self,
+        from_label: str,
+        to_label: str,
+        relationship_type: str,
+        pairs: list[dict],
+        match_key: str = "id",
+        database: str | None = None,
+    ) -> int:
+        """
+        Create many relationships with one query per batch.
+
+        Args:
+            from_label: Source node label
+            to_label: Target node label
+            relationship_type: Relationship type
+            pairs: Dicts with "from_id", "to_id" and optional "props"
+            match_key: Node property compared with from_id/to_id (default "id")
+            database: Database name (optional)
+
+        Returns:
+            Number of relationships created
+
+        Usage:
+            created = await neo4j_helper.create_relationships(
+                "Person", "Person", "KNOWS",
+                [{"from_id": 1, "to_id": 2, "props": {"since": 2020}}]
+            )
+        """
+        query = _create_relationships_query(
+            from_label, to_label, relationship_type, match_key
+        )
+        return await self._write_batches(query, "pairs", pairs, database)
+
     async def find_nodes(
         self,
         label: str,
@@ -222,17 +540,10 @@ class Neo4jHelper:
                 limit=10
             )
         """
-        if properties:
-            props = " AND ".join(f"n.{k} = ${k}" for k in properties.keys())
-            query = f"MATCH (n:{label}) WHERE {props} RETURN n"
-            if limit:
-                query += f" LIMIT {limit}"
-            params = properties
-        else:
-            query = f"MATCH (n:{label}) RETURN n"
-            if limit:
-                query += f" LIMIT {limit}"
-            params = {}
+        query = _find_nodes_query(label, _key_signature(properties), bool(limit))
+        params = dict(properties or {})
+        if limit:
+            params["__limit"] = limit
 
         return await self.execute_query(query, params, database)
 
@@ -269,33 +580,18 @@ class Neo4jHelper:
                 {"since": 2020}
             )
         """
-        # Build match conditions
-        from_match = " AND ".join(f"a.{k} = $from_{k}" for k in from_props.keys())
-        to_match = " AND ".join(f"b.{k} = $to_{k}" for k in to_props.keys())
-
-        # Build relationship properties
-        if relationship_props:
-            rel_props = ", ".join(
-                f"{k}: $rel_{k}" for k in relationship_props.keys()
-            )
-            rel_create = f"-[r:{relationship_type} {{{rel_props}}}]->"
-        else:
-            rel_create = f"-[r:{relationship_type}]->"
-
-        query = f"""
-            MATCH (a:{from_label}), (b:{to_label})
-            WHERE {from_match} AND {to_match}
-            CREATE (a){rel_create}(b)
-            RETURN r
-        """
+        from_keys = _key_signature(from_props)
+        to_keys = _key_signature(to_props)
+        rel_keys = _key_signature(relationship_props)
+        query = _create_relationship_query(
+            from_label, from_keys, to_label, to_keys, relationship_type, rel_keys
+        )
 
         # Combine all parameters
-        params = {
-            **{f"from_{k}": v for k, v in from_props.items()},
-            **{f"to_{k}": v for k, v in to_props.items()},
-        }
-        if relationship_props:
-            params.update({f"rel_{k}": v for k, v in relationship_props.items()})
+        params = _prefixed_params("from_", from_keys, from_props)
+        params.update(_prefixed_params("to_", to_keys, to_props))
+        if rel_keys:
+            params.update(_prefixed_params("rel_", rel_keys, relationship_props))
 
         result = await self.execute_write(query, params, database)
         return result["data"][0] if result["data"] else {}
@@ -309,10 +605,18 @@ class Neo4jHelper:
         relationship_type: str | None = None,
         max_depth: int = 5,
         database: str | None = None,
+        graph_name: str | None = None,
+        weight_property: str | None = None,
     ) -> list[dict]:
         """
         Find shortest path between two nodes.
 
+        With graph_name, the search runs as GDS Dijkstra over that existing
+        in-memory projection instead of Cypher's shortestPath(), which is
+        much faster on large graphs and deep paths. The projection decides
+        which relationships are traversed, so relationship_type and
+        max_depth are ignored in that mode.
+
         Args:
             from_label: Source node label
             from_props: Source node properties
@@ -321,6 +625,10 @@ class Neo4jHelper:
             relationship_type: Relationship type to traverse (optional)
             max_depth: Maximum path depth (default 5)
             database: Database name (optional)
+            graph_name: GDS projection to search (optional, requires the
+                Graph Data Science plugin)
+            weight_property: Relationship property used as cost in GDS mode
+                (optional, unweighted if None)
 
         Returns:
             Shortest path as list of nodes and relationships
@@ -332,25 +640,23 @@ class Neo4jHelper:
                 "KNOWS"
             )
         """
-        from_match = " AND ".join(f"a.{k} = $from_{k}" for k in from_props.keys())
-        to_match = " AND ".join(f"b.{k} = $to_{k}" for k in to_props.keys())
-
-        if relationship_type:
-            rel = f"[:{relationship_type}*1..{max_depth}]"
-        else:
-            rel = f"[*1..{max_depth}]"
-
-        query = f"""
-            MATCH (a:{from_label}), (b:{to_label}),
-                  p = shortestPath((a){rel}(b))
-            WHERE {from_match} AND {to_match}
-            RETURN p
-        """
+        from_keys = _key_signature(from_props)
+        to_keys = _key_signature(to_props)
+        params = _prefixed_params("from_", from_keys, from_props)
+        params.update(_prefixed_params("to_", to_keys, to_props))
+
+        if graph_name:
+            query = _gds_shortest_path_query(
+                from_label, from_keys, to_label, to_keys, weight_property is not None
+            )
+            params["__graph"] = graph_name
+            if weight_property is not None:
+                params["__weight"] = weight_property
+            return await self.execute_query(query, params, database)
 
-        params = {
-            **{f"from_{k}": v for k, v in from_props.items()},
-            **{f"to_{k}": v for k, v in to_props.items()},
-        }
+        query = _shortest_path_query(
+            from_label, from_keys, to_label, to_keys, relationship_type, max_depth
+        )
 
         return await self.execute_query(query, params, database)
 
@@ -379,9 +685,10 @@ class Neo4jHelper:
                 {"name": "Alice"}
             )
         """
-        props = " AND ".join(f"n.{k} = ${k}" for k in properties.keys())
-        delete_clause = "DETACH DELETE" if detach else "DELETE"
-        query = f"MATCH (n:{label}) WHERE {props} {delete_clause} n RETURN count(n) as deleted"
+        if not properties:
+            raise ValueError("delete_node requires at least one property to match")
+
+        query = _delete_node_query(label, _key_signature(properties), detach)
 
         result = await self.execute_write(query, properties, database)
         return result["data"][0].get("deleted", 0) if result["data"] else 0
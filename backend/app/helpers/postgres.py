@@ -1,20 +1,57 @@
+import re
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from functools import lru_cache
+from typing import AsyncGenerator, Literal
 
-from sqlalchemy import text
+import numpy as np
+from pgvector.asyncpg import register_vector
+from sqlalchemy import TextClause, event, text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.config.settings import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Each metric needs an index built with the matching operator class
+# (vector_l2_ops, vector_cosine_ops, vector_ip_ops)
+DISTANCE_OPERATORS = {"l2": "<->", "cosine": "<=>", "ip": "<#>"}
+# Table names are interpolated into SQL, so they must be plain identifiers
+TABLE_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+
+@lru_cache(maxsize=256)
+def _vector_search_query(table: str, op: str, thresholded: bool) -> TextClause:
+    """Build each query shape once so its SQL text (and prepared plan) is reused."""
+    where = f"WHERE embedding {op} :embedding < :threshold" if thresholded else ""
+    return text(f"""
+        SELECT *, embedding {op} :embedding AS distance
+        FROM {table}
+        {where}
+        ORDER BY embedding {op} :embedding
+        LIMIT :limit
+    """)
+
+
+async def _register_vector(conn) -> None:
+    try:
+        await register_vector(conn)
+    except ValueError as e:
+        # Extension not created yet (fresh database before migrations)
+        logger.warning(f"pgvector codec not registered: {e}")
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    """Send vector parameters in pgvector's binary format instead of text."""
+    dbapi_connection.run_async(_register_vector)
+
 
 class PostgreSQLHelper:
     """Singleton pattern to ensure single engine instance."""
@@ -38,11 +75,23 @@ class PostgreSQLHelper:
             self._engine = create_async_engine(
                 settings.database_url,
                 echo=settings.app_debug,
-                pool_pre_ping=True,
-                pool_size=5,
-                max_overflow=10,
+                poolclass=AsyncAdaptedQueuePool,
+                # No per-checkout SELECT 1; stale connections are recycled
+                # and /health pings the database explicitly
+                pool_pre_ping=False,
+                pool_recycle=1800,
+                pool_size=settings.postgres_pool_size,
+                max_overflow=settings.postgres_max_overflow,
+                # Keep prepared statements per connection so repeated queries
+                # skip PARSE on the second and later executions
+                connect_args={
+                    "prepared_statement_cache_size": 512,
+                    "statement_cache_size": 512,
+                },
                 future=True,
             )
+            if settings.enable_pgvector:
+                event.listen(self._engine.sync_engine, "connect", _on_connect)
 
             self._session_factory = async_sessionmaker(
                 self._engine,
@@ -92,6 +141,24 @@ class PostgreSQLHelper:
             finally:
                 await session.close()
 
+    @asynccontextmanager
+    async def get_autocommit_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """Connection outside a transaction block (e.g. for CREATE INDEX CONCURRENTLY)."""
+        engine = self.get_engine()
+
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            yield conn
+
+    async def ping(self) -> None:
+        """SELECT 1 on a pooled connection, without a session or BEGIN/COMMIT."""
+        engine = self.get_engine()
+
+        async with engine.connect() as conn:
+            raw_conn = await conn.get_raw_connection()
+            # asyncpg caches the prepared statement per connection
+            await raw_conn.driver_connection.fetchval("SELECT 1")
+
     def get_engine(self) -> AsyncEngine:
         if self._engine is None:
             raise RuntimeError(
@@ -99,48 +166,59 @@ class PostgreSQLHelper:
             )
         return self._engine
 
-    async def execute_raw(self, query: str, params: dict | None = None):
+    async def execute_raw(self, query, params: dict | None = None):
+        if isinstance(query, str):
+            query = text(query)
         async with self.get_session() as session:
             result = await session.execute(query, params or {})
             return result
 
     async def vector_search(
         self,
-        embedding: list[float],
+        embedding: np.ndarray | list[float],
         table: str,
         limit: int = 10,
         distance_threshold: float | None = None,
+        metric: Literal["l2", "cosine", "ip"] = "l2",
+        ef_search: int | None = None,
     ):
         """
         Requires PGVector extension and table with 'embedding' column of type vector.
+
+        ORDER BY repeats the distance operator expression rather than the
+        select alias, which is the form pgvector's HNSW/IVFFlat indexes
+        match; the index must use the operator class of the chosen metric.
+        The embedding is sent in pgvector's binary format (registered per
+        connection), so pass a float32 array to skip any conversion.
+
+        ef_search sets hnsw.ef_search for this query's transaction only
+        (higher = better recall, slower); None keeps the server default.
         """
         if not settings.enable_pgvector:
             raise RuntimeError("PGVector is not enabled")
+        if not TABLE_NAME_PATTERN.match(table):
+            raise ValueError(f"Invalid table name: {table!r}")
+
+        query = _vector_search_query(
+            table, DISTANCE_OPERATORS[metric], distance_threshold is not None
+        )
 
-        if distance_threshold:
-            query = f"""
-                SELECT *, embedding <-> :embedding::vector as distance
-                FROM {table}
-                WHERE embedding <-> :embedding::vector < :threshold
-                ORDER BY distance
-                LIMIT :limit
-            """
-            params = {
-                "embedding": str(embedding),
-                "threshold": distance_threshold,
-                "limit": limit,
-            }
-        else:
-            query = f"""
-                SELECT *, embedding <-> :embedding::vector as distance
-                FROM {table}
-                ORDER BY distance
-                LIMIT :limit
-            """
-            params = {"embedding": str(embedding), "limit": limit}
-
-        result = await self.execute_raw(query, params)
-        return result.fetchall()
+        params = {
+            "embedding": np.asarray(embedding, dtype=np.float32),
+            "limit": limit,
+        }
+        if distance_threshold is not None:
+            params["threshold"] = distance_threshold
+
+        async with self.get_session() as session:
+            if ef_search is not None:
+                # Scoped to the transaction, so pooled connections keep defaults
+                await session.execute(
+                    text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+                    {"ef_search": str(max(ef_search, limit))},
+                )
+            result = await session.execute(query, params)
+            return result.fetchall()
 
 
 postgres_helper = PostgreSQLHelper()
@@ -9,13 +9,20 @@ Use this for non-Celery use cases:
 """
 
 import asyncio
-import json
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 try:
     import aio_pika
     from aio_pika import Message, ExchangeType
-    from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractQueue
+    from aio_pika.abc import (
+        AbstractChannel,
+        AbstractConnection,
+        AbstractExchange,
+        AbstractIncomingMessage,
+        AbstractQueue,
+    )
     AIOPIKA_AVAILABLE = True
 except ImportError:
     AIOPIKA_AVAILABLE = False
@@ -23,6 +30,8 @@ except ImportError:
     AbstractQueue = Any  # type: ignore
     AbstractChannel = Any  # type: ignore
     AbstractConnection = Any  # type: ignore
+    AbstractIncomingMessage = Any  # type: ignore
+    AbstractExchange = Any  # type: ignore
 
 from app.config.settings import settings
 from app.core.logging import get_logger
@@ -30,12 +39,96 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 
 
+class _AckBatcher:
+    """
+    Acknowledge a consumer's deliveries in batches with multiple=True.
+
+    A multiple ack covers every lower delivery tag on the channel, so acks
+    only go up to the oldest delivery still being processed; handlers that
+    finish out of order wait for it rather than acking it early.
+
+    Args:
+        batch_size: Completed deliveries that trigger an ack
+        interval: Seconds before a partial batch is acked
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._unsettled: set[int] = set()
+        self._done: Dict[int, AbstractIncomingMessage] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def received(self, message: AbstractIncomingMessage) -> None:
+        self._unsettled.add(message.delivery_tag)
+
+    async def ack(self, message: AbstractIncomingMessage) -> None:
+        self._unsettled.discard(message.delivery_tag)
+        self._done[message.delivery_tag] = message
+        if len(self._done) >= self.batch_size:
+            await self.flush()
+        else:
+            self._schedule()
+
+    async def nack(self, message: AbstractIncomingMessage, requeue: bool) -> None:
+        self._unsettled.discard(message.delivery_tag)
+        await message.nack(requeue=requeue)
+
+    def _schedule(self) -> None:
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.interval, self._flush_later
+            )
+
+    def _flush_later(self) -> None:
+        # Hold a reference so the task is not collected mid-flush
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        """Ack every completed delivery below the oldest unsettled one."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        oldest = min(self._unsettled, default=None)
+        ready = [tag for tag in self._done if oldest is None or tag < oldest]
+        if ready:
+            last = self._done[max(ready)]
+            for tag in ready:
+                del self._done[tag]
+            try:
+                await last.ack(multiple=True)
+            except Exception as e:
+                # Channel was lost; the broker redelivers these
+                logger.warning(f"Batch ack failed: {e}")
+
+        if self._done:
+            self._schedule()
+
+    async def close(self) -> None:
+        """Wait for timer-driven flushes, then ack what is ready."""
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
 class RabbitMQHelper:
     """RabbitMQ async helper for direct queue operations."""
 
     def __init__(self):
         self._connection: Optional[AbstractConnection] = None
         self._channel: Optional[AbstractChannel] = None
+        self._consumer_channels: list[AbstractChannel] = []
+        self._ack_batchers: list[_AckBatcher] = []
+        # Declarations on the shared channel, so publishes skip the round-trip
+        self._exchange_cache: Dict[tuple[str, str, bool], AbstractExchange] = {}
+        self._queue_cache: Dict[tuple[str, bool, bool, bool], AbstractQueue] = {}
         self.enabled = settings.enable_rabbitmq and AIOPIKA_AVAILABLE
 
     async def initialize(self):
@@ -53,18 +146,56 @@ class RabbitMQHelper:
                 broker_url,
                 loop=asyncio.get_event_loop(),
             )
+            self._connection.reconnect_callbacks.add(self._clear_declarations)
 
             # Create channel
-            self._channel = await self._connection.channel()
-            await self._channel.set_qos(prefetch_count=10)
+            # Confirm mode: publishes resolve once the broker has them
+            self._channel = await self._connection.channel(publisher_confirms=True)
+            await self._channel.set_qos(
+                prefetch_count=settings.rabbitmq_prefetch_count,
+                prefetch_size=settings.rabbitmq_prefetch_size,
+            )
 
             logger.info("RabbitMQ connection established")
         except Exception as e:
             logger.error(f"Failed to connect to RabbitMQ: {e}")
             self.enabled = False
 
+    def _clear_declarations(self, *_args) -> None:
+        self._exchange_cache.clear()
+        self._queue_cache.clear()
+
+    @staticmethod
+    def _build_message(message: Dict[str, Any], durable: bool) -> "Message":
+        return Message(
+            orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS),
+            delivery_mode=2 if durable else 1,  # Persistent or transient
+            content_type="application/json",
+        )
+
+    async def _declare_exchange(
+        self, name: str, exchange_type: str, durable: bool
+    ) -> AbstractExchange:
+        key = (name, exchange_type, durable)
+        exchange = self._exchange_cache.get(key)
+        if exchange is None:
+            exchange = await self._channel.declare_exchange(
+                name,
+                type=ExchangeType(exchange_type),
+                durable=durable,
+            )
+            self._exchange_cache[key] = exchange
+        return exchange
+
     async def close(self):
         """Close RabbitMQ connection."""
+        for batcher in self._ack_batchers:
+            await batcher.close()
+        self._ack_batchers.clear()
+        for channel in self._consumer_channels:
+            await channel.close()
+        self._consumer_channels.clear()
+        self._clear_declarations()
         if self._channel:
             await self._channel.close()
         if self._connection:
@@ -92,25 +223,56 @@ class RabbitMQHelper:
         if not self.enabled or not self._channel:
             raise RuntimeError("RabbitMQ is not initialized")
 
-        # Declare exchange
-        ex = await self._channel.declare_exchange(
-            exchange,
-            type=ExchangeType(exchange_type),
-            durable=durable,
-        )
+        ex = await self._declare_exchange(exchange, exchange_type, durable)
 
-        # Create message
-        body = json.dumps(message).encode()
-        msg = Message(
-            body,
-            delivery_mode=2 if durable else 1,  # Persistent or transient
-            content_type="application/json",
-        )
+        msg = self._build_message(message, durable)
 
         # Publish
         await ex.publish(msg, routing_key=routing_key)
         logger.debug(f"Published message to {exchange}/{routing_key}")
 
+    async def publish_batch(
+        self,
+        exchange: str,
+        items: List[Tuple[str, Dict[str, Any]]],
+        exchange_type: str = "topic",
+        durable: bool = True,
+    ):
+        """
+        Publish many messages and wait for all broker confirms together.
+
+        Publishes are pipelined on the channel instead of each waiting for
+        its own confirm, so the batch costs about one round-trip.
+
+        Args:
+            exchange: Exchange name
+            items: (routing_key, payload) pairs
+            exchange_type: Exchange type (topic, direct, fanout, headers)
+            durable: Whether messages should survive broker restart
+
+        Raises:
+            Exception: The first failed publish (e.g. a broker nack), after
+                all publishes have settled
+        """
+        if not self.enabled or not self._channel:
+            raise RuntimeError("RabbitMQ is not initialized")
+
+        ex = await self._declare_exchange(exchange, exchange_type, durable)
+        results = await asyncio.gather(
+            *(
+                ex.publish(self._build_message(payload, durable), routing_key=routing_key)
+                for routing_key, payload in items
+            ),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            logger.error(
+                f"{len(errors)} of {len(items)} publishes to {exchange} failed"
+            )
+            raise errors[0]
+        logger.debug(f"Published {len(items)} messages to {exchange}")
+
     async def consume_messages(
         self,
         queue_name: str,
@@ -119,10 +281,16 @@ class RabbitMQHelper:
         routing_key: Optional[str] = None,
         exchange_type: str = "topic",
         durable: bool = True,
+        prefetch_count: Optional[int] = None,
+        ack_batch_size: Optional[int] = None,
+        ack_interval_ms: Optional[float] = None,
     ):
         """
         Consume messages from queue.
 
+        Successful messages are acked in batches; a failed message is
+        requeued once and dropped if it fails again on redelivery.
+
         Args:
             queue_name: Queue name
             callback: Async function to handle messages
@@ -130,19 +298,43 @@ class RabbitMQHelper:
             routing_key: Optional routing key for binding
             exchange_type: Exchange type
             durable: Whether queue should survive broker restart
+            prefetch_count: Per-consumer override of RABBITMQ_PREFETCH_COUNT,
+                e.g. a small value for handlers that take seconds per message
+            ack_batch_size: Override of RABBITMQ_ACK_BATCH_SIZE
+            ack_interval_ms: Override of RABBITMQ_ACK_INTERVAL_MS
         """
         if not self.enabled or not self._channel:
             raise RuntimeError("RabbitMQ is not initialized")
 
+        if prefetch_count is None:
+            prefetch_count = settings.rabbitmq_prefetch_count
+        batcher = _AckBatcher(
+            ack_batch_size or settings.rabbitmq_ack_batch_size,
+            (ack_interval_ms or settings.rabbitmq_ack_interval_ms) / 1000,
+        )
+        if prefetch_count:
+            # A full ack batch must fit in the prefetch window
+            prefetch_count = max(prefetch_count, batcher.batch_size)
+
+        # QoS and delivery tags are per channel, so each consumer gets its
+        # own and multiple=True acks never cover another consumer's messages
+        channel = await self._connection.channel()
+        await channel.set_qos(
+            prefetch_count=prefetch_count,
+            prefetch_size=settings.rabbitmq_prefetch_size,
+        )
+        self._consumer_channels.append(channel)
+        self._ack_batchers.append(batcher)
+
         # Declare queue
-        queue = await self._channel.declare_queue(
+        queue = await channel.declare_queue(
             queue_name,
             durable=durable,
         )
 
         # Bind to exchange if specified
         if exchange and routing_key:
-            ex = await self._channel.declare_exchange(
+            ex = await channel.declare_exchange(
                 exchange,
                 type=ExchangeType(exchange_type),
                 durable=durable,
@@ -151,12 +343,15 @@ class RabbitMQHelper:
 
         # Consume messages
         async def process_message(message):
-            async with message.process():
-                try:
-                    body = json.loads(message.body.decode())
-                    await callback(body)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
+            batcher.received(message)
+            try:
+                body = orjson.loads(message.body)
+                await callback(body)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                await batcher.nack(message, requeue=not message.redelivered)
+            else:
+                await batcher.ack(message)
 
         await queue.consume(process_message)
         logger.info(f"Started consuming from queue: {queue_name}")
@@ -183,12 +378,18 @@ class RabbitMQHelper:
         if not self.enabled or not self._channel:
             raise RuntimeError("RabbitMQ is not initialized")
 
+        key = (queue_name, durable, auto_delete, exclusive)
+        queue = self._queue_cache.get(key)
+        if queue is not None:
+            return queue
+
         queue = await self._channel.declare_queue(
             queue_name,
             durable=durable,
             auto_delete=auto_delete,
             exclusive=exclusive,
         )
+        self._queue_cache[key] = queue
 
         logger.info(f"Created queue: {queue_name}")
         return queue
@@ -210,11 +411,7 @@ class RabbitMQHelper:
         if not self.enabled or not self._channel:
             raise RuntimeError("RabbitMQ is not initialized")
 
-        await self._channel.declare_exchange(
-            exchange_name,
-            type=ExchangeType(exchange_type),
-            durable=durable,
-        )
+        await self._declare_exchange(exchange_name, exchange_type, durable)
 
         logger.info(f"Created exchange: {exchange_name} ({exchange_type})")
 
@@ -234,6 +431,9 @@ class RabbitMQHelper:
 
         queue = await self._channel.get_queue(queue_name)
         await queue.delete()
+        self._queue_cache = {
+            key: cached for key, cached in self._queue_cache.items() if key[0] != queue_name
+        }
         logger.info(f"Deleted queue: {queue_name}")
 
 
@@ -9,10 +9,10 @@ Provides:
 - Cache decorators
 """
 
-import json
 from functools import wraps
 from typing import Any, Callable
 
+import orjson
 from redis import asyncio as aioredis
 
 from app.config.settings import settings
@@ -20,6 +20,13 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# One-character type tags in front of stored values, so get() knows how to
+# decode without trial-parsing; control characters never start a legacy
+# (untagged) value in practice
+STR_TAG = "\x01"
+JSON_TAG = "\x02"
+_JSON_TAG_BYTES = JSON_TAG.encode()
+
 
 class RedisHelper:
     """
@@ -30,6 +37,7 @@ class RedisHelper:
 
     _instance = None
     _client: aioredis.Redis | None = None
+    _binary_client: aioredis.Redis | None = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -74,11 +82,14 @@ class RedisHelper:
 
         try:
             await self._client.close()
+            if self._binary_client is not None:
+                await self._binary_client.close()
             logger.info("Redis connection closed")
         except Exception as e:
             logger.error(f"Error closing Redis connection: {e}")
         finally:
             self._client = None
+            self._binary_client = None
 
     def get_client(self) -> aioredis.Redis:
         """
@@ -94,6 +105,66 @@ class RedisHelper:
             raise RuntimeError("Redis not initialized. Call initialize() first.")
         return self._client
 
+    def get_binary_client(self) -> aioredis.Redis:
+        """
+        Get a Redis client that returns raw bytes.
+
+        The main client decodes responses as UTF-8, which corrupts binary
+        values such as packed vectors.
+
+        Returns:
+            Redis client with decode_responses disabled
+
+        Raises:
+            RuntimeError: If Redis not initialized
+        """
+        if self._client is None:
+            raise RuntimeError("Redis not initialized. Call initialize() first.")
+        if self._binary_client is None:
+            self._binary_client = aioredis.from_url(
+                settings.redis_url,
+                decode_responses=False,
+                max_connections=10,
+            )
+        return self._binary_client
+
+    @staticmethod
+    def _encode(value: Any) -> str | bytes:
+        # Strings are stored as-is; everything else is JSON serialized
+        if isinstance(value, str):
+            return STR_TAG + value
+        return _JSON_TAG_BYTES + orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def _decode(value: str | None) -> Any | None:
+        if value is None:
+            return None
+        tag = value[:1]
+        if tag == STR_TAG:
+            return value[1:]
+        if tag == JSON_TAG:
+            return orjson.loads(value[1:])
+        # Untagged values written before tags were introduced
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value
+
+    def pipeline(self, transaction: bool = False):
+        """
+        Get a pipeline that sends queued commands in one round-trip.
+
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC (default False)
+
+        Usage:
+            async with redis_helper.pipeline() as pipe:
+                pipe.incr("hits")
+                pipe.expire("hits", 60)
+                await pipe.execute()
+        """
+        return self.get_client().pipeline(transaction=transaction)
+
     async def get(self, key: str) -> Any | None:
         """
         Get value by key.
@@ -105,15 +176,22 @@ class RedisHelper:
             Value or None if not found
         """
         client = self.get_client()
-        value = await client.get(key)
+        return self._decode(await client.get(key))
 
-        if value is None:
-            return None
+    async def mget(self, keys: list[str]) -> list[Any | None]:
+        """
+        Get many values in one round-trip.
 
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return value
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values in key order, None where not found
+        """
+        if not keys:
+            return []
+        client = self.get_client()
+        return [self._decode(value) for value in await client.mget(keys)]
 
     async def set(
         self,
@@ -133,16 +211,32 @@ class RedisHelper:
             True if successful
         """
         client = self.get_client()
-
-        # Serialize non-string values
-        if not isinstance(value, str):
-            value = json.dumps(value)
+        value = self._encode(value)
 
         if ttl:
             return await client.setex(key, ttl, value)
         else:
             return await client.set(key, value)
 
+    async def mset(self, mapping: dict[str, Any], ttl: int | None = None) -> bool:
+        """
+        Set many key-value pairs in one round-trip.
+
+        Args:
+            mapping: Keys and values (values JSON serialized if not string)
+            ttl: Time to live in seconds for every key (optional)
+
+        Returns:
+            True if all keys were set
+        """
+        if not mapping:
+            return True
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, self._encode(value), ex=ttl or None)
+            results = await pipe.execute()
+        return all(results)
+
     async def delete(self, key: str) -> int:
         """
         Delete key from cache.
@@ -215,6 +309,9 @@ class RedisHelper:
         """
         Delete all keys matching pattern.
 
+        Walks the keyspace with SCAN and removes keys with UNLINK, so neither
+        the lookup nor the frees block Redis on large databases.
+
         Args:
             pattern: Key pattern (e.g., "user:*")
 
@@ -222,10 +319,16 @@ class RedisHelper:
             Number of keys deleted
         """
         client = self.get_client()
-        keys = await client.keys(pattern)
-        if keys:
-            return await client.delete(*keys)
-        return 0
+        deleted = 0
+        batch: list[str] = []
+        async for key in client.scan_iter(match=pattern, count=1000):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += await client.unlink(*batch)
+                batch.clear()
+        if batch:
+            deleted += await client.unlink(*batch)
+        return deleted
 
     def cache(self, ttl: int = 300, key_prefix: str = ""):
         """
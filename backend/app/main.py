@@ -3,6 +3,7 @@ Main FastAPI application entry point.
 
 Features:
 - CORS middleware for frontend integration
+- GZip compression for non-streaming responses
 - Exception handlers for standardized error responses
 - Health check endpoints
 - OpenTelemetry instrumentation
@@ -15,9 +16,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.config.settings import settings
+from app.core.compression import SelectiveGZipMiddleware
 from app.core.logging import get_logger, setup_logging
 from app.core.telemetry import setup_telemetry
 
@@ -149,6 +151,30 @@ async def shutdown_services():
         except Exception as e:
             logger.error(f"Error closing Neo4j: {e}")
 
+    if settings.enable_llm_litellm:
+        try:
+            from app.helpers.llm.litellm_client import litellm_client
+
+            await litellm_client.close()
+            logger.info("LiteLLM request batcher stopped")
+        except Exception as e:
+            logger.error(f"Error stopping LiteLLM request batcher: {e}")
+
+    try:
+        from app.helpers.llm.http_session import close_shared_session
+
+        await close_shared_session()
+        logger.info("Shared model HTTP session closed")
+    except Exception as e:
+        logger.error(f"Error closing shared model HTTP session: {e}")
+
+    try:
+        from app.api.v1.health import close_ollama_client
+
+        await close_ollama_client()
+    except Exception as e:
+        logger.error(f"Error closing health check HTTP client: {e}")
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -159,6 +185,7 @@ app = FastAPI(
     redoc_url="/redoc" if settings.app_debug else None,
     openapi_url="/openapi.json" if settings.app_debug else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -168,6 +195,18 @@ app.add_middleware(
     allow_credentials=settings.cors_allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=settings.cors_max_age,
+)
+
+# Compress JSON responses; SSE endpoints stream uncompressed
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    excluded_paths=(
+        f"{settings.api_v1_prefix}/rag/documents/ingest",
+        f"{settings.api_v1_prefix}/rag/chat/stream",
+    ),
+    minimum_size=1024,
+    compresslevel=5,
 )
 
 
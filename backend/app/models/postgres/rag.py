@@ -2,22 +2,46 @@ from typing import Optional
 from uuid import uuid4
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.postgres.base import Base, TimestampMixin
 
 
+class HalfVector(Vector):
+    """pgvector ``halfvec`` column (float16 storage, same text wire format as Vector)."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "HALFVEC(%d)" % self.dim
+
+
 class RagDocument(Base, TimestampMixin):
     __tablename__ = "rag_documents"
+    __table_args__ = (
+        Index(
+            "uq_rag_documents_folder_file", "folder_path", "file_name", unique=True
+        ),
+        Index("ix_rag_documents_folder_status", "folder_path", "status"),
+        Index(
+            "ix_rag_documents_pending",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index(
+            "ix_rag_documents_metadata_gin",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
     )
-    file_name: Mapped[str] = mapped_column(
-        String(500), nullable=False, unique=True
-    )
+    file_name: Mapped[str] = mapped_column(String(500), nullable=False)
     file_path: Mapped[str] = mapped_column(String(2000), nullable=False)
     file_type: Mapped[str] = mapped_column(
         String(50), nullable=False
@@ -26,9 +50,7 @@ class RagDocument(Base, TimestampMixin):
     file_hash: Mapped[str] = mapped_column(
         String(64), nullable=False, index=True
     )  # SHA-256
-    folder_path: Mapped[str] = mapped_column(
-        String(2000), nullable=False, index=True
-    )
+    folder_path: Mapped[str] = mapped_column(String(2000), nullable=False)
     markdown_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(
         String(50), default="pending", nullable=False
@@ -46,6 +68,14 @@ class RagDocument(Base, TimestampMixin):
 
 class RagChunk(Base, TimestampMixin):
     __tablename__ = "rag_chunks"
+    __table_args__ = (
+        Index(
+            "ix_rag_chunks_metadata_gin",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
@@ -60,7 +90,7 @@ class RagChunk(Base, TimestampMixin):
     content: Mapped[str] = mapped_column(Text, nullable=False)
     token_count: Mapped[int] = mapped_column(Integer, nullable=False)
     embedding: Mapped[Optional[list[float]]] = mapped_column(
-        Vector(768), nullable=True
+        HalfVector(768), nullable=True
     )  # nomic-embed-text dimension
     metadata_: Mapped[dict] = mapped_column(
         "metadata", JSONB, default=dict, nullable=False
@@ -95,15 +125,16 @@ class RagConversation(Base, TimestampMixin):
 
 class RagMessage(Base, TimestampMixin):
     __tablename__ = "rag_messages"
+    __table_args__ = {"postgresql_partition_by": "HASH (conversation_id)"}
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
     )
+    # Partition key, so it must be part of the primary key
     conversation_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("rag_conversations.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True,
+        primary_key=True,
     )
     sequence: Mapped[int] = mapped_column(Integer, nullable=False)
     role: Mapped[str] = mapped_column(
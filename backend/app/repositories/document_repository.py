@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
 from app.schemas.document import DocumentCreate, DocumentUpdate
 
@@ -110,7 +111,7 @@ class DocumentRepository:
             result = await self.collection.find_one_and_update(
                 {"_id": ObjectId(document_id)},
                 {"$set": update_data},
-                return_document=True,
+                return_document=ReturnDocument.AFTER,
             )
 
             if result:
@@ -168,20 +169,30 @@ class DocumentRepository:
 
     async def find_all(
         self,
-        skip: int = 0,
+        after: Optional[str] = None,
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
         """
-        Get all documents.
+        Get all documents, paginated by _id.
 
         Args:
-            skip: Number of documents to skip
+            after: Return documents with an _id greater than this one
             limit: Maximum number of documents to return
 
         Returns:
-            List of documents
+            List of documents ordered by _id
+
+        Raises:
+            ValueError: If after is not a valid ObjectId
         """
-        cursor = self.collection.find({}).skip(skip).limit(limit)
+        query: Dict[str, Any] = {}
+        if after is not None:
+            if not ObjectId.is_valid(after):
+                raise ValueError(f"Invalid cursor: {after}")
+            query["_id"] = {"$gt": ObjectId(after)}
+
+        # Keyset pagination walks the _id index; cost doesn't grow with depth
+        cursor = self.collection.find(query).sort("_id", 1).limit(limit)
         docs = await cursor.to_list(length=limit)
 
         for doc in docs:
@@ -191,12 +202,12 @@ class DocumentRepository:
 
     async def count_all(self) -> int:
         """
-        Count all documents.
+        Estimate the number of documents from collection metadata.
 
         Returns:
-            Number of documents
+            Approximate number of documents
         """
-        return await self.collection.count_documents({})
+        return await self.collection.estimated_document_count()
 
     async def count_by_user(self, user_id: int) -> int:
         """
@@ -11,6 +11,14 @@ from neo4j import AsyncSession
 
 from app.schemas.graph import NodeCreate, RelationshipCreate
 
+# Fixed query text so Neo4j plans it once and serves it from the plan cache
+GET_NODE_QUERY = """
+MATCH (n)
+WHERE elementId(n) = $node_id
+RETURN elementId(n) as id, n.name as name, n.node_type as node_type,
+       n.properties as properties, n.created_at as created_at
+"""
+
 
 class GraphRepository:
     """Repository for graph operations in Neo4j."""
@@ -59,14 +67,7 @@ class GraphRepository:
         Returns:
             Node data or None
         """
-        query = """
-        MATCH (n)
-        WHERE elementId(n) = $node_id
-        RETURN elementId(n) as id, n.name as name, n.node_type as node_type,
-               n.properties as properties, n.created_at as created_at
-        """
-
-        result = await self.session.run(query, node_id=node_id)
+        result = await self.session.run(GET_NODE_QUERY, node_id=node_id)
         record = await result.single()
         return dict(record) if record else None
 
@@ -198,6 +199,90 @@ class GraphRepository:
 
         return dict(record)
 
+    async def get_node_with_neighbors(
+        self,
+        node_id: str,
+        relationship_types: Optional[List[str]] = None,
+        direction: str = "both",
+        depth: int = 1,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a node together with its neighbors in a single round trip.
+
+        Args:
+            node_id: Center node ID
+            relationship_types: Filter by relationship types
+            direction: "incoming", "outgoing", or "both"
+            depth: Traversal depth
+
+        Returns:
+            Center node, neighbors and traversed relationships, or None if
+            the center node does not exist
+        """
+        if direction == "incoming":
+            rel_pattern = "<-[r*1..%d]-" % depth
+        elif direction == "outgoing":
+            rel_pattern = "-[r*1..%d]->" % depth
+        else:
+            rel_pattern = "-[r*1..%d]-" % depth
+
+        type_filter = ""
+        if relationship_types:
+            type_filter = (
+                "WHERE all(rel IN r WHERE rel.relationship_type IN $relationship_types)"
+            )
+
+        query = f"""
+        MATCH (center)
+        WHERE elementId(center) = $node_id
+        OPTIONAL MATCH (center){rel_pattern}(neighbor)
+        {type_filter}
+        WITH center, collect(DISTINCT neighbor) AS neighbor_nodes, collect(r) AS paths
+        RETURN {{
+                   id: elementId(center),
+                   name: center.name,
+                   node_type: center.node_type,
+                   properties: center.properties,
+                   created_at: center.created_at
+               }} as center,
+               [n IN neighbor_nodes | {{
+                   id: elementId(n),
+                   name: n.name,
+                   node_type: n.node_type,
+                   properties: n.properties,
+                   created_at: n.created_at
+               }}] as neighbors,
+               [rel IN reduce(acc = [], p IN paths | acc + p) | {{
+                   id: elementId(rel),
+                   relationship_type: rel.relationship_type,
+                   properties: rel.properties,
+                   created_at: rel.created_at,
+                   from_node_id: elementId(startNode(rel)),
+                   to_node_id: elementId(endNode(rel))
+               }}] as relationships
+        """
+
+        result = await self.session.run(
+            query,
+            node_id=node_id,
+            relationship_types=relationship_types,
+        )
+        record = await result.single()
+
+        if not record:
+            return None
+
+        # Variable-length paths share relationships; keep each one once
+        relationships = list(
+            {rel["id"]: rel for rel in record["relationships"]}.values()
+        )
+
+        return {
+            "center": record["center"],
+            "neighbors": record["neighbors"],
+            "relationships": relationships,
+        }
+
     async def execute_cypher(
         self,
         query: str,
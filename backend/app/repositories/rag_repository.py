@@ -1,12 +1,13 @@
 import logging
 import math
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
-from sqlalchemy import func, select, text
+from sqlalchemy import func, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config.settings import settings
 from app.models.postgres.rag import (
     RagChunk,
     RagConversation,
@@ -16,6 +17,25 @@ from app.models.postgres.rag import (
 
 logger = logging.getLogger(__name__)
 
+# HNSW candidate list size per recall target (pgvector default is 40)
+HNSW_EF_SEARCH_BY_RECALL = {0.95: 40, 0.99: 100, 0.999: 200}
+
+
+def ef_search_for(limit: int, recall_target: Optional[float] = None) -> int:
+    if recall_target is None:
+        ef_search = settings.rag_hnsw_ef_search
+    else:
+        ef_search = next(
+            (
+                ef
+                for recall, ef in sorted(HNSW_EF_SEARCH_BY_RECALL.items())
+                if recall >= recall_target
+            ),
+            max(HNSW_EF_SEARCH_BY_RECALL.values()),
+        )
+    # HNSW returns at most ef_search rows
+    return max(ef_search, limit)
+
 
 class RagRepository:
     def __init__(self, session: AsyncSession):
@@ -61,9 +81,14 @@ class RagRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_document_by_name(self, file_name: str) -> Optional[RagDocument]:
+    async def get_document_by_name(
+        self, folder_path: str, file_name: str
+    ) -> Optional[RagDocument]:
         result = await self.session.execute(
-            select(RagDocument).where(RagDocument.file_name == file_name)
+            select(RagDocument).where(
+                RagDocument.folder_path == folder_path,
+                RagDocument.file_name == file_name,
+            )
         )
         return result.scalar_one_or_none()
 
@@ -145,6 +170,27 @@ class RagRepository:
         await self.session.flush()
         return chunks
 
+    async def bulk_insert_chunks(
+        self,
+        chunks_data: list[dict],
+        batch_size: int = 500,
+    ) -> int:
+        # Multi-row INSERTs without per-object ORM state; one round trip per batch
+        rows = [
+            {
+                "document_id": data["document_id"],
+                "chunk_index": data["chunk_index"],
+                "content": data["content"],
+                "token_count": data["token_count"],
+                "embedding": data.get("embedding"),
+                "metadata_": data.get("metadata", {}),
+            }
+            for data in chunks_data
+        ]
+        for i in range(0, len(rows), batch_size):
+            await self.session.execute(insert(RagChunk), rows[i : i + batch_size])
+        return len(rows)
+
     async def get_chunks_by_document(self, document_id: UUID) -> list[RagChunk]:
         result = await self.session.execute(
             select(RagChunk)
@@ -159,9 +205,16 @@ class RagRepository:
         folder_path: Optional[str] = None,
         limit: int = 5,
         similarity_threshold: float = 0.0,
+        recall_target: Optional[float] = None,
     ) -> list[dict]:
         embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
 
+        # Scoped to the current transaction, so pooled connections keep defaults
+        await self.session.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {"ef_search": str(ef_search_for(limit, recall_target))},
+        )
+
         conn = await self.session.connection()
         raw_conn = await conn.get_raw_connection()
         driver_conn = raw_conn.driver_connection
@@ -169,22 +222,22 @@ class RagRepository:
         if folder_path:
             query_str = """
                 SELECT
-                    c.id,
+                    c.id::text as id,
                     c.content,
                     c.chunk_index,
                     c.token_count,
                     c.metadata,
-                    d.id as document_id,
+                    d.id::text as document_id,
                     d.file_name,
                     d.file_path,
-                    1 - (c.embedding <=> $1::vector) as similarity
+                    1 - (c.embedding <=> $1::halfvec) as similarity
                 FROM rag_chunks c
                 JOIN rag_documents d ON c.document_id = d.id
                 WHERE d.status = 'completed'
                   AND c.embedding IS NOT NULL
                   AND d.folder_path = $2
-                  AND (1 - (c.embedding <=> $1::vector)) >= $3
-                ORDER BY c.embedding <=> $1::vector
+                  AND (1 - (c.embedding <=> $1::halfvec)) >= $3
+                ORDER BY c.embedding <=> $1::halfvec
                 LIMIT $4
             """
             rows = await driver_conn.fetch(
@@ -194,21 +247,21 @@ class RagRepository:
         else:
             query_str = """
                 SELECT
-                    c.id,
+                    c.id::text as id,
                     c.content,
                     c.chunk_index,
                     c.token_count,
                     c.metadata,
-                    d.id as document_id,
+                    d.id::text as document_id,
                     d.file_name,
                     d.file_path,
-                    1 - (c.embedding <=> $1::vector) as similarity
+                    1 - (c.embedding <=> $1::halfvec) as similarity
                 FROM rag_chunks c
                 JOIN rag_documents d ON c.document_id = d.id
                 WHERE d.status = 'completed'
                   AND c.embedding IS NOT NULL
-                  AND (1 - (c.embedding <=> $1::vector)) >= $2
-                ORDER BY c.embedding <=> $1::vector
+                  AND (1 - (c.embedding <=> $1::halfvec)) >= $2
+                ORDER BY c.embedding <=> $1::halfvec
                 LIMIT $3
             """
             rows = await driver_conn.fetch(
@@ -216,6 +269,7 @@ class RagRepository:
                 embedding_str, similarity_threshold, limit
             )
 
+        # IDs come back as text from Postgres; no UUID decode + str() per row
         results = []
         for row in rows:
             similarity = float(row["similarity"])
@@ -223,12 +277,12 @@ class RagRepository:
                 logger.warning(f"[VECTOR_SEARCH] Skipping chunk with NaN similarity")
                 continue
             results.append({
-                "id": str(row["id"]),
+                "id": row["id"],
                 "content": row["content"],
                 "chunk_index": row["chunk_index"],
                 "token_count": row["token_count"],
                 "metadata": row["metadata"],
-                "document_id": str(row["document_id"]),
+                "document_id": row["document_id"],
                 "file_name": row["file_name"],
                 "file_path": row["file_path"],
                 "similarity": similarity,
@@ -286,6 +340,34 @@ class RagRepository:
         )
         return list(result.scalars().all())
 
+    async def stream_conversation_summaries(
+        self, limit: int = 20
+    ) -> AsyncIterator[dict[str, Any]]:
+        # Count messages in SQL rather than loading them to take len()
+        message_count = (
+            select(func.count(RagMessage.id))
+            .where(RagMessage.conversation_id == RagConversation.id)
+            .correlate(RagConversation)
+            .scalar_subquery()
+        )
+        result = await self.session.stream(
+            select(
+                RagConversation.id,
+                RagConversation.title,
+                RagConversation.folder_path,
+                RagConversation.created_at,
+                message_count.label("message_count"),
+            )
+            .where(RagConversation.is_active == True)  # noqa: E712
+            .order_by(RagConversation.created_at.desc())
+            .limit(limit)
+        )
+        try:
+            async for row in result.mappings():
+                yield row
+        finally:
+            await result.close()
+
     async def update_conversation_title(
         self, conv_id: UUID, title: str
     ) -> None:
@@ -62,8 +62,8 @@ class DocumentList(BaseModel):
 
     documents: List[DocumentResponse]
     total: int
-    page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class SearchQuery(BaseModel):
@@ -21,6 +21,9 @@ class FolderContents(BaseModel):
 
 class DocumentIngestRequest(BaseModel):
     folder_path: str = Field(..., description="Path to folder containing documents")
+    batch_size: int = Field(
+        default=500, ge=1, le=5000, description="Chunks per bulk INSERT statement"
+    )
 
 
 class DocumentStatus(BaseModel):
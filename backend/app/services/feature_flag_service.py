@@ -7,7 +7,7 @@ Provides caching and database operations for feature flags.
 import asyncio
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
@@ -132,6 +132,41 @@ class FeatureFlagService:
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def list_flags_projection(
+        self, category: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        List feature flags as plain column mappings.
+
+        Selects only the listed columns and skips ORM object construction,
+        for read-only listings.
+
+        Args:
+            category: Optional category filter
+
+        Returns:
+            List of row mappings keyed by column name
+        """
+        query = select(
+            FeatureFlag.id,
+            FeatureFlag.key,
+            FeatureFlag.name,
+            FeatureFlag.description,
+            FeatureFlag.category,
+            FeatureFlag.enabled,
+            FeatureFlag.config,
+            FeatureFlag.created_at,
+            FeatureFlag.updated_at,
+        )
+
+        if category:
+            query = query.where(FeatureFlag.category == category)
+
+        query = query.order_by(FeatureFlag.category, FeatureFlag.key)
+
+        result = await self.session.execute(query)
+        return list(result.mappings().all())
+
     async def create_flag(self, data: FeatureFlagCreate) -> FeatureFlag:
         """
         Create a new feature flag.
@@ -171,28 +206,35 @@ class FeatureFlagService:
         Returns:
             Updated feature flag or None if not found
         """
-        result = await self.session.execute(
-            select(FeatureFlag).where(FeatureFlag.key == key)
-        )
-        flag = result.scalar_one_or_none()
-
-        if not flag:
-            return None
-
         # Update fields if provided
+        values: dict[str, Any] = {}
         if data.enabled is not None:
-            flag.enabled = data.enabled
+            values["enabled"] = data.enabled
         if data.name is not None:
-            flag.name = data.name
+            values["name"] = data.name
         if data.description is not None:
-            flag.description = data.description
+            values["description"] = data.description
         if data.category is not None:
-            flag.category = data.category
+            values["category"] = data.category
         if data.metadata is not None:
-            flag.config = data.metadata
+            values["config"] = data.metadata
+
+        if not values:
+            return await self.get_flag(key)
+
+        # UPDATE ... RETURNING hands back the new row in the same round trip
+        result = await self.session.execute(
+            update(FeatureFlag)
+            .where(FeatureFlag.key == key)
+            .values(**values)
+            .returning(FeatureFlag)
+        )
+        flag = result.scalar_one_or_none()
+
+        if not flag:
+            return None
 
         await self.session.commit()
-        await self.session.refresh(flag)
 
         # Invalidate cache
         self.invalidate_cache(key)
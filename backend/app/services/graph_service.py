@@ -4,6 +4,7 @@ Graph service for Neo4j operations.
 Handles graph-based business logic.
 """
 
+import re
 from typing import List, Optional
 
 from neo4j import AsyncSession
@@ -17,6 +18,13 @@ from app.schemas.graph import (
     PathResponse,
 )
 
+# Node IDs compared against inline literals instead of $parameters; each
+# distinct literal is a new query text and misses the Neo4j plan cache
+LITERAL_ID_PATTERN = re.compile(
+    r"\b(?:elementId|id)\s*\(\s*\w+\s*\)\s*(?:=|<>|IN)\s*[\[\'\"\d]",
+    re.IGNORECASE,
+)
+
 
 class GraphService:
     """Service for graph operations."""
@@ -95,10 +103,47 @@ class GraphService:
             "total": len(result.get("neighbors", [])),
         }
 
+    async def get_node_with_neighbors(
+        self,
+        node_id: str,
+        relationship_types: Optional[List[str]] = None,
+        direction: str = "both",
+        depth: int = 1,
+    ) -> Optional[dict]:
+        """Get a node with its neighbors and relationships in one query."""
+        result = await self.repository.get_node_with_neighbors(
+            node_id,
+            relationship_types,
+            direction,
+            depth,
+        )
+
+        if not result:
+            return None
+
+        return {
+            "center_node": NodeResponse(**result["center"]),
+            "neighbors": [NodeResponse(**n) for n in result["neighbors"]],
+            "relationships": [
+                RelationshipResponse(**r) for r in result["relationships"]
+            ],
+            "total": len(result["neighbors"]),
+        }
+
     async def delete_node(self, node_id: str) -> bool:
         """Delete node."""
         return await self.repository.delete_node(node_id)
 
     async def execute_query(self, query: str, parameters: dict = None) -> list:
-        """Execute custom Cypher query."""
+        """
+        Execute custom Cypher query.
+
+        Raises:
+            ValueError: If the query inlines node IDs instead of binding them
+        """
+        if LITERAL_ID_PATTERN.search(query):
+            raise ValueError(
+                "Node IDs must be passed as query parameters (e.g. "
+                "elementId(n) = $node_id), not inlined in the query"
+            )
         return await self.repository.execute_cypher(query, parameters)
@@ -1,14 +1,28 @@
+import asyncio
 import logging
 from typing import Any, Optional, TypedDict
 
 from langgraph.graph import END, StateGraph
 
+from app.config.settings import settings
 from app.helpers.llm.ollama_client import ollama_client
 from app.repositories.rag_repository import RagRepository
 from app.services.rag.embedding_service import EmbeddingService
+from app.services.rag.retrieval_cache import retrieval_cache
 
 logger = logging.getLogger(__name__)
 
+# Byte-identical on every request so Ollama can reuse its prefill from the
+# KV cache; history follows it and the per-turn context goes last
+SYSTEM_PROMPT = """You are a helpful AI assistant that answers questions based on the provided documents.
+
+INSTRUCTIONS:
+- Answer based on the provided context when possible
+- Be concise but thorough
+- If the context doesn't contain relevant information, acknowledge this and provide what help you can
+- Reference specific documents when citing information
+- If unsure, acknowledge uncertainty rather than making things up"""
+
 
 class AgentState(TypedDict):
     messages: list[dict[str, str]]
@@ -17,6 +31,7 @@ class AgentState(TypedDict):
     sources: list[dict[str, Any]]
     folder_path: Optional[str]
     final_response: Optional[str]
+    query_embedding_task: Optional["asyncio.Task[list[float]]"]
 
 
 class RagChatAgent:
@@ -31,7 +46,29 @@ class RagChatAgent:
         self.embedding_service = embedding_service
         self.model = model
         self.top_k = top_k
-        self.graph = self._build_graph()
+        self._graph: Optional[StateGraph] = None
+
+    @property
+    def graph(self) -> StateGraph:
+        # chat() runs the nodes directly; only compile the graph on demand
+        if self._graph is None:
+            self._graph = self._build_graph()
+        return self._graph
+
+    def prefetch_query_embedding(
+        self, query: str, folder_path: Optional[str]
+    ) -> Optional["asyncio.Task[list[float]]"]:
+        # Start the embedding round trip early so it overlaps caller work;
+        # skipped when retrieval will be served from the exact-match cache
+        if (
+            settings.rag_retrieval_cache_enabled
+            and retrieval_cache.get_exact(folder_path, query) is not None
+        ):
+            return None
+        task = asyncio.create_task(self.embedding_service.embed_text(query))
+        # Mark failures as retrieved when the caller bails out before awaiting
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
 
     def _build_graph(self) -> StateGraph:
         workflow = StateGraph(AgentState)
@@ -47,11 +84,34 @@ class RagChatAgent:
     async def _retrieve_node(self, state: AgentState) -> dict[str, Any]:
         query = state["query"]
         folder_path = state.get("folder_path")
+        embedding_task = state.get("query_embedding_task")
 
         logger.info(f"[RETRIEVE] Query: {query[:100]}")
 
         try:
-            query_embedding = await self.embedding_service.embed_text(query)
+            use_cache = (
+                settings.rag_retrieval_cache_enabled
+                and await retrieval_cache.refresh()
+            )
+            generation = retrieval_cache.generation
+            if use_cache:
+                cached = retrieval_cache.get_exact(folder_path, query)
+                if cached is not None:
+                    if embedding_task:
+                        embedding_task.cancel()
+                    logger.info(f"[RETRIEVE] Exact cache hit ({len(cached)} chunks)")
+                    return {"sources": cached}
+
+            if embedding_task:
+                query_embedding = await embedding_task
+            else:
+                query_embedding = await self.embedding_service.embed_text(query)
+
+            if use_cache:
+                cached = retrieval_cache.get_similar(folder_path, query_embedding)
+                if cached is not None:
+                    return {"sources": cached}
+
             results = await self.repository.vector_search(
                 embedding=query_embedding,
                 folder_path=folder_path,
@@ -68,6 +128,11 @@ class RagChatAgent:
                     "document_id": row["document_id"],
                 })
 
+            if use_cache:
+                retrieval_cache.put(
+                    folder_path, query, query_embedding, sources, generation
+                )
+
             logger.info(f"[RETRIEVE] Retrieved {len(sources)} relevant chunks")
             return {"sources": sources}
 
@@ -101,16 +166,7 @@ class RagChatAgent:
         context = state["context"]
         query = state["query"]
 
-        system_prompt = """You are a helpful AI assistant that answers questions based on the provided documents.
-
-INSTRUCTIONS:
-- Answer based on the provided context when possible
-- Be concise but thorough
-- If the context doesn't contain relevant information, acknowledge this and provide what help you can
-- Reference specific documents when citing information
-- If unsure, acknowledge uncertainty rather than making things up"""
-
-        ollama_messages = [{"role": "system", "content": system_prompt}]
+        ollama_messages = [{"role": "system", "content": SYSTEM_PROMPT}]
         for msg in messages:
             ollama_messages.append({
                 "role": msg["role"],
@@ -128,10 +184,17 @@ USER QUESTION:
         logger.info(f"[GENERATE] Prompt: {user_prompt[:300]}...")
 
         try:
+            options = {}
+            if settings.enable_kv_cache:
+                # Keep the model (and its cached prompt prefix) resident
+                # between turns instead of reloading and re-prefilling
+                options["keep_alive"] = settings.ollama_keep_alive
+
             response = await ollama_client.chat(
                 messages=ollama_messages,
                 model=self.model,
                 temperature=0.7,
+                **options,
             )
 
             logger.info(f"[GENERATE] Response generated successfully ({len(response['content'])} chars)")
@@ -151,6 +214,7 @@ USER QUESTION:
         query: str,
         conversation_history: Optional[list[dict[str, str]]] = None,
         folder_path: Optional[str] = None,
+        query_embedding_task: Optional["asyncio.Task[list[float]]"] = None,
     ) -> dict[str, Any]:
         state: AgentState = {
             "messages": conversation_history or [],
@@ -159,6 +223,7 @@ USER QUESTION:
             "context": "",
             "sources": [],
             "final_response": None,
+            "query_embedding_task": query_embedding_task,
         }
 
         retrieve_result = await self._retrieve_node(state)
@@ -1,9 +1,11 @@
+import asyncio
 import logging
 from typing import Optional
 
 import aiohttp
 
 from app.config.settings import settings
+from app.helpers.llm.http_session import get_shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -23,64 +25,111 @@ class EmbeddingService:
 
         url = f"{self.base_url}/api/embeddings"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                json={
-                    "model": self.model,
-                    "prompt": text,
-                },
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return data["embedding"]
+        session = await get_shared_session()
+        async with session.post(
+            url,
+            json={
+                "model": self.model,
+                "prompt": text,
+            },
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return data["embedding"]
+
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # One request for the whole list via Ollama's batch endpoint
+        url = f"{self.base_url}/api/embed"
+
+        session = await get_shared_session()
+        async with session.post(
+            url,
+            json={
+                "model": self.model,
+                "input": texts,
+            },
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return data["embeddings"]
 
     async def embed_batch(
         self,
         texts: list[str],
-        batch_size: int = 10,
+        batch_size: Optional[int] = None,
+        parallel_workers: Optional[int] = None,
     ) -> list[list[float]]:
-        embeddings = []
+        batch_size = batch_size or settings.ingestion_batch_size
+        semaphore = asyncio.Semaphore(
+            parallel_workers or settings.ingestion_parallel_workers
+        )
+        # Batch texts of similar length together so the model pads less,
+        # then scatter results back to the caller's order
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_texts = [texts[i] for i in order]
+        batches = [
+            sorted_texts[i : i + batch_size]
+            for i in range(0, len(sorted_texts), batch_size)
+        ]
+
+        async def embed_one(batch_idx: int, batch: list[str]) -> list[list[float]]:
+            # Keep a few batches in flight so request latency overlaps
+            async with semaphore:
+                batch_embeddings = await self._embed_pending(batch)
+            logger.debug(f"Embedded batch {batch_idx + 1}/{len(batches)}")
+            return batch_embeddings
+
+        # gather returns results in batch order regardless of completion order
+        results = await asyncio.gather(
+            *(embed_one(idx, batch) for idx, batch in enumerate(batches))
+        )
+        embeddings: list[list[float]] = [[] for _ in texts]
+        sorted_embeddings = (embedding for batch in results for embedding in batch)
+        for original_idx, embedding in zip(order, sorted_embeddings):
+            embeddings[original_idx] = embedding
+        return embeddings
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            batch_embeddings = []
+    async def _embed_pending(self, batch: list[str]) -> list[list[float]]:
+        # Return zero vector for empty text
+        batch_embeddings = [[0.0] * 768 for _ in batch]
+        pending = [(idx, text) for idx, text in enumerate(batch) if text.strip()]
+        if not pending:
+            return batch_embeddings
 
-            for text in batch:
+        try:
+            results = await self.embed_documents([text for _, text in pending])
+        except Exception as e:
+            logger.warning(f"Batch embedding failed, embedding one by one: {e}")
+            results = []
+            for _, text in pending:
                 try:
-                    if text.strip():
-                        embedding = await self.embed_text(text)
-                        batch_embeddings.append(embedding)
-                    else:
-                        # Return zero vector for empty text
-                        batch_embeddings.append([0.0] * 768)
+                    results.append(await self.embed_text(text))
                 except Exception as e:
                     logger.error(f"Failed to embed text: {e}")
                     # Return zero vector on error
-                    batch_embeddings.append([0.0] * 768)
+                    results.append([0.0] * 768)
 
-            embeddings.extend(batch_embeddings)
-            logger.debug(
-                f"Embedded batch {i // batch_size + 1}, "
-                f"total: {len(embeddings)}/{len(texts)}"
-            )
+        for (idx, _), embedding in zip(pending, results):
+            batch_embeddings[idx] = embedding
 
-        return embeddings
+        return batch_embeddings
 
     async def is_available(self) -> bool:
         try:
             url = f"{self.base_url}/api/tags"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=5) as response:
-                    if response.status != 200:
-                        return False
-                    data = await response.json()
-                    models = [m["name"] for m in data.get("models", [])]
-                    # Check if our model is available (with or without :latest tag)
-                    return any(
-                        self.model in m or m.startswith(f"{self.model}:")
-                        for m in models
-                    )
+            session = await get_shared_session()
+            async with session.get(
+                url, timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status != 200:
+                    return False
+                data = await response.json()
+                models = [m["name"] for m in data.get("models", [])]
+                # Check if our model is available (with or without :latest tag)
+                return any(
+                    self.model in m or m.startswith(f"{self.model}:")
+                    for m in models
+                )
         except Exception as e:
             logger.warning(f"Ollama embedding service not available: {e}")
             return False
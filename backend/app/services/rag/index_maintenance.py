@@ -0,0 +1,76 @@
+"""
+Maintenance routines for the rag_chunks HNSW index.
+
+Every insert into an indexed table pays an incremental graph update, so
+large ingests are faster when the index is dropped first and built once
+after the chunks are loaded.
+"""
+
+import logging
+
+from sqlalchemy import text
+
+from app.helpers.postgres import postgres_helper
+
+logger = logging.getLogger(__name__)
+
+HNSW_INDEX_NAME = "ix_rag_chunks_embedding_hnsw"
+
+# (max vector count, m, ef_construction); larger graphs need more links per
+# node to hold recall at the same ef_search
+HNSW_BUILD_PARAMS = (
+    (100_000, 16, 64),
+    (1_000_000, 24, 128),
+)
+HNSW_LARGE_BUILD_PARAMS = (32, 128)
+
+
+def hnsw_params_for(vector_count: int) -> tuple[int, int]:
+    for max_count, m, ef_construction in HNSW_BUILD_PARAMS:
+        if vector_count < max_count:
+            return m, ef_construction
+    return HNSW_LARGE_BUILD_PARAMS
+
+
+async def drop_hnsw_index() -> None:
+    async with postgres_helper.get_autocommit_connection() as conn:
+        await conn.execute(
+            text(f"DROP INDEX CONCURRENTLY IF EXISTS {HNSW_INDEX_NAME}")
+        )
+    logger.info(f"[HNSW] Dropped index {HNSW_INDEX_NAME}")
+
+
+async def build_hnsw_index() -> None:
+    async with postgres_helper.get_autocommit_connection() as conn:
+        result = await conn.execute(
+            text("SELECT count(*) FROM rag_chunks WHERE embedding IS NOT NULL")
+        )
+        m, ef_construction = hnsw_params_for(result.scalar_one())
+
+        await conn.execute(text("SET maintenance_work_mem = '2GB'"))
+        await conn.execute(text("SET max_parallel_maintenance_workers = 7"))
+        try:
+            await conn.execute(
+                text(
+                    f"""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS {HNSW_INDEX_NAME}
+                    ON rag_chunks
+                    USING hnsw (embedding halfvec_cosine_ops)
+                    WITH (m = {m}, ef_construction = {ef_construction})
+                    """
+                )
+            )
+        finally:
+            # Session settings would otherwise stick to the pooled connection
+            await conn.execute(text("RESET maintenance_work_mem"))
+            await conn.execute(text("RESET max_parallel_maintenance_workers"))
+    logger.info(
+        f"[HNSW] Built index {HNSW_INDEX_NAME} "
+        f"(m={m}, ef_construction={ef_construction})"
+    )
+
+
+async def rebuild_hnsw_index() -> None:
+    # Dropping first also clears an INVALID index left by a failed build
+    await drop_hnsw_index()
+    await build_hnsw_index()
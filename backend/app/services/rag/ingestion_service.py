@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import logging
 from datetime import datetime
@@ -23,12 +24,15 @@ class IngestionService:
         embedding_service: EmbeddingService,
         chunk_size: int = 5000,
         chunk_overlap: int = 500,
+        insert_batch_size: int = 500,
+        tokenizer: Optional[tiktoken.Encoding] = None,
     ):
         self.repository = repository
         self.embedding_service = embedding_service
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self.insert_batch_size = insert_batch_size
+        self.tokenizer = tokenizer or tiktoken.get_encoding("cl100k_base")
         self.documents_root = Path(settings.documents_root).expanduser().resolve()
 
     def normalize_folder_path(self, folder_path: Optional[str]) -> str:
@@ -75,7 +79,7 @@ class IngestionService:
         return sorted(files, key=lambda x: x["name"])
 
     async def ingest_folder(
-        self, folder_path: str
+        self, folder_path: str, batch_size: Optional[int] = None
     ) -> AsyncGenerator[dict, None]:
         normalized_path = self.normalize_folder_path(folder_path)
         files = self.list_folder_files(normalized_path)
@@ -100,7 +104,9 @@ class IngestionService:
             }
 
             try:
-                await self._ingest_single_file(file_info, normalized_path)
+                await self._ingest_single_file(
+                    file_info, normalized_path, batch_size
+                )
                 logger.info(f"Ingested: {file_info['name']}")
             except Exception as e:
                 logger.error(f"Failed to ingest {file_info['name']}: {e}")
@@ -122,10 +128,19 @@ class IngestionService:
         }
 
     async def _ingest_single_file(
-        self, file_info: dict, folder_path: str
+        self,
+        file_info: dict,
+        folder_path: str,
+        batch_size: Optional[int] = None,
     ) -> None:
-        file_hash = self._compute_file_hash(file_info["path"])
-        existing = await self.repository.get_document_by_name(file_info["name"])
+        # Hashing, conversion and splitting are blocking; run them off the
+        # event loop so the SSE stream and other requests keep flowing
+        file_hash = await asyncio.to_thread(
+            self._compute_file_hash, file_info["path"]
+        )
+        existing = await self.repository.get_document_by_name(
+            folder_path, file_info["name"]
+        )
 
         if existing:
             await self.repository.delete_document(existing.id)
@@ -141,12 +156,16 @@ class IngestionService:
         )
 
         try:
-            markdown_content = self._convert_to_markdown(file_info["path"])
+            markdown_content = await asyncio.to_thread(
+                self._convert_to_markdown, file_info["path"]
+            )
             await self.repository.update_document_content(
                 document.id, markdown_content
             )
 
-            chunks = self._chunk_markdown(markdown_content, document.id)
+            chunks = await asyncio.to_thread(
+                self._chunk_markdown, markdown_content, document.id
+            )
             if not chunks:
                 raise ValueError("No chunks generated from document")
 
@@ -156,7 +175,9 @@ class IngestionService:
             for chunk, embedding in zip(chunks, embeddings):
                 chunk["embedding"] = embedding
 
-            await self.repository.create_chunks_batch(chunks)
+            await self.repository.bulk_insert_chunks(
+                chunks, batch_size=batch_size or self.insert_batch_size
+            )
             await self.repository.update_document_status(
                 document.id, "completed"
             )
@@ -1,9 +1,13 @@
 import logging
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import AsyncGenerator, Optional
 from uuid import UUID
 
+import tiktoken
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.helpers.postgres import postgres_helper
 from app.repositories.rag_repository import RagRepository
 from app.schemas.rag import (
     ChatResponse,
@@ -17,18 +21,41 @@ from app.schemas.rag import (
 from app.services.rag.chat_agent import RagChatAgent
 from app.services.rag.embedding_service import EmbeddingService
 from app.services.rag.ingestion_service import IngestionService
+from app.services.rag.retrieval_cache import retrieval_cache
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class RagClients:
+    """Stateless collaborators shared by every RagService instance."""
+
+    embedding_service: EmbeddingService
+    tokenizer: tiktoken.Encoding
+
+
+@lru_cache
+def get_rag_clients() -> RagClients:
+    return RagClients(
+        embedding_service=EmbeddingService(),
+        tokenizer=tiktoken.get_encoding("cl100k_base"),
+    )
+
+
 class RagService:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        clients: Optional[RagClients] = None,
+    ):
+        clients = clients or get_rag_clients()
         self.session = session
         self.repository = RagRepository(session)
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = clients.embedding_service
         self.ingestion_service = IngestionService(
             repository=self.repository,
             embedding_service=self.embedding_service,
+            tokenizer=clients.tokenizer,
         )
         self.chat_agent = RagChatAgent(
             repository=self.repository,
@@ -54,13 +81,22 @@ class RagService:
         )
 
     async def ingest_folder(
-        self, folder_path: str
+        self, folder_path: str, batch_size: Optional[int] = None
     ) -> AsyncGenerator[dict, None]:
         normalized_path = self.ingestion_service.normalize_folder_path(folder_path)
-        async for progress in self.ingestion_service.ingest_folder(normalized_path):
-            yield progress
-            if progress.get("type") in ("progress", "complete"):
-                await self.session.commit()
+        try:
+            async for progress in self.ingestion_service.ingest_folder(
+                normalized_path, batch_size=batch_size
+            ):
+                yield progress
+                if progress.get("type") in ("progress", "complete"):
+                    await self.session.commit()
+                    # Cached retrievals may point at the chunks just replaced
+                    await retrieval_cache.invalidate()
+        finally:
+            # A client disconnect stops the loop before the next progress
+            # event, but work may already have been committed
+            await retrieval_cache.invalidate()
 
     async def get_document_status(
         self, folder_path: str
@@ -85,42 +121,52 @@ class RagService:
         conversation_id: Optional[UUID] = None,
         folder_path: Optional[str] = None,
     ) -> ChatResponse:
-        if conversation_id:
-            conversation = await self.repository.get_conversation_with_messages(
-                conversation_id
-            )
-            if not conversation:
-                raise LookupError(f"Conversation not found: {conversation_id}")
-        else:
-            normalized_path = self.ingestion_service.normalize_folder_path(folder_path)
-            conversation = await self.repository.create_conversation(
-                folder_path=normalized_path
-            )
-
-        normalized_path = self.ingestion_service.normalize_folder_path(
-            folder_path or conversation.folder_path
+        # Overlap the query embedding request with the conversation lookup;
+        # retrieval is always scoped to the documents root
+        embedding_task = self.chat_agent.prefetch_query_embedding(
+            message, str(self.ingestion_service.documents_root)
         )
-        if conversation.folder_path and conversation.folder_path != normalized_path:
-            raise ValueError(
-                "Conversation folder does not match the configured documents root"
+        try:
+            if conversation_id:
+                conversation = await self.repository.get_conversation_with_messages(
+                    conversation_id
+                )
+                if not conversation:
+                    raise LookupError(f"Conversation not found: {conversation_id}")
+            else:
+                normalized_path = self.ingestion_service.normalize_folder_path(folder_path)
+                conversation = await self.repository.create_conversation(
+                    folder_path=normalized_path
+                )
+
+            normalized_path = self.ingestion_service.normalize_folder_path(
+                folder_path or conversation.folder_path
             )
-        if not conversation.folder_path:
-            conversation.folder_path = normalized_path
-            await self.session.flush()
-
-        history = []
-        if conversation_id and conversation.messages:
-            for msg in conversation.messages:
-                history.append({
-                    "role": msg.role,
-                    "content": msg.content,
-                })
-
-        result = await self.chat_agent.chat(
-            query=message,
-            conversation_history=history,
-            folder_path=normalized_path,
-        )
+            if conversation.folder_path and conversation.folder_path != normalized_path:
+                raise ValueError(
+                    "Conversation folder does not match the configured documents root"
+                )
+            if not conversation.folder_path:
+                conversation.folder_path = normalized_path
+                await self.session.flush()
+
+            history = []
+            if conversation_id and conversation.messages:
+                for msg in conversation.messages:
+                    history.append({
+                        "role": msg.role,
+                        "content": msg.content,
+                    })
+
+            result = await self.chat_agent.chat(
+                query=message,
+                conversation_history=history,
+                folder_path=normalized_path,
+                query_embedding_task=embedding_task,
+            )
+        finally:
+            if embedding_task and not embedding_task.done():
+                embedding_task.cancel()
 
         await self.repository.add_message(
             conversation_id=conversation.id,
@@ -173,6 +219,16 @@ class RagService:
             for c in conversations
         ]
 
+    async def list_conversations_stream(
+        self, limit: int = 20
+    ) -> AsyncGenerator[ConversationSummary, None]:
+        # The response body is iterated after the request's get_db session
+        # has closed, so the stream reads through a session of its own
+        async with postgres_helper.get_session() as session:
+            repository = RagRepository(session)
+            async for row in repository.stream_conversation_summaries(limit=limit):
+                yield ConversationSummary(**row)
+
     async def get_conversation(
         self, conversation_id: UUID
     ) -> ConversationDetail:
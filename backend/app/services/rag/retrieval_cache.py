@@ -0,0 +1,167 @@
+import logging
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from app.config.settings import settings
+from app.helpers.redis_helper import redis_helper
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "rag:retrieval_cache:generation"
+
+
+class RetrievalCache:
+    """
+    In-process cache of retrieval results keyed by query.
+
+    Exact repeats of a query (after whitespace/case normalization) skip both
+    the embedding call and the vector search. Near-duplicates whose query
+    embedding is within the cosine threshold of a cached one skip the
+    vector search. Entries live in a fixed-size ring buffer so the
+    similarity probe is a single matrix-vector product.
+
+    Each worker keeps its own entries, so ingestion bumps a generation
+    counter in Redis and readers call refresh() first to drop entries from
+    an older generation. Without Redis there is no way to hear about other
+    workers' ingests, and refresh() tells callers to bypass the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        similarity_threshold: float = 0.97,
+        ttl_seconds: float = 300.0,
+    ):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: list[Optional[dict[str, Any]]] = [None] * max_entries
+        self._by_query: dict[tuple[str, str], int] = {}
+        self._next_slot = 0
+        self._filled = 0
+        self._generation: Optional[int] = None
+
+    @property
+    def generation(self) -> Optional[int]:
+        return self._generation
+
+    async def refresh(self) -> bool:
+        """Adopt the shared generation; False means the cache must be bypassed."""
+        try:
+            value = await redis_helper.get_client().get(GENERATION_KEY)
+        except Exception as e:
+            logger.debug(f"[RETRIEVAL_CACHE] Generation unavailable: {e}")
+            return False
+
+        generation = int(value or 0)
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+        return True
+
+    async def invalidate(self) -> None:
+        """Drop entries here and, via the shared generation, in every worker."""
+        self.clear()
+        try:
+            self._generation = await redis_helper.get_client().incr(GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"[RETRIEVAL_CACHE] Failed to bump generation: {e}")
+            self._generation = None
+
+    @staticmethod
+    def _query_key(folder_path: Optional[str], query: str) -> tuple[str, str]:
+        return folder_path or "", " ".join(query.lower().split())
+
+    def _live_entry(self, slot: int, folder_path: Optional[str]) -> Optional[dict]:
+        entry = self._entries[slot]
+        if entry is None or entry["folder_path"] != (folder_path or ""):
+            return None
+        if entry["expires_at"] < time.monotonic():
+            return None
+        return entry
+
+    def get_exact(
+        self, folder_path: Optional[str], query: str
+    ) -> Optional[list[dict[str, Any]]]:
+        slot = self._by_query.get(self._query_key(folder_path, query))
+        if slot is None:
+            return None
+        entry = self._live_entry(slot, folder_path)
+        return entry["sources"] if entry else None
+
+    def get_similar(
+        self, folder_path: Optional[str], embedding: list[float]
+    ) -> Optional[list[dict[str, Any]]]:
+        if self._vectors is None or self._filled == 0:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+
+        scores = self._vectors[: self._filled] @ (query / norm)
+        candidates = np.flatnonzero(scores >= self.similarity_threshold)
+        for slot in candidates[np.argsort(scores[candidates])[::-1]]:
+            entry = self._live_entry(int(slot), folder_path)
+            if entry:
+                logger.info(
+                    f"[RETRIEVAL_CACHE] Semantic hit (similarity={scores[slot]:.4f})"
+                )
+                return entry["sources"]
+        return None
+
+    def put(
+        self,
+        folder_path: Optional[str],
+        query: str,
+        embedding: list[float],
+        sources: list[dict[str, Any]],
+        generation: Optional[int] = None,
+    ) -> None:
+        # Results searched before an invalidation may already be stale
+        if generation != self._generation:
+            return
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+        slot = self._next_slot
+        evicted = self._entries[slot]
+        if evicted is not None:
+            self._by_query.pop(evicted["key"], None)
+
+        key = self._query_key(folder_path, query)
+        self._vectors[slot] = vector / norm
+        self._entries[slot] = {
+            "key": key,
+            "folder_path": key[0],
+            "sources": sources,
+            "expires_at": time.monotonic() + self.ttl_seconds,
+        }
+        self._by_query[key] = slot
+
+        self._next_slot = (slot + 1) % self.max_entries
+        self._filled = max(self._filled, slot + 1)
+
+    def clear(self) -> None:
+        self._vectors = None
+        self._entries = [None] * self.max_entries
+        self._by_query.clear()
+        self._next_slot = 0
+        self._filled = 0
+
+
+retrieval_cache = RetrievalCache(
+    max_entries=settings.rag_retrieval_cache_size,
+    similarity_threshold=settings.rag_retrieval_cache_threshold,
+    ttl_seconds=settings.rag_retrieval_cache_ttl,
+)